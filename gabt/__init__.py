@@ -0,0 +1,44 @@
+"""Núcleo de la Batería de Aptitudes GABT (sin dependencias de Streamlit).
+
+Los nombres públicos se resuelven al primer acceso, de modo que ``import gabt`` no
+carga numpy ni pandas hasta que realmente se usan.
+"""
+
+from importlib import import_module
+
+_EXPORTS = {
+    "APTITUDES_MAP": "gabt.aptitudes",
+    "AREAS": "gabt.aptitudes",
+    "N_PREGUNTAS_POR_AREA": "gabt.aptitudes",
+    "cargar_banco": "gabt.banco",
+    "invalidar_banco": "gabt.banco",
+    "generate_gatb_questions": "gabt.banco",
+    "clasificar_percentil": "gabt.puntuacion",
+    "calificar_global": "gabt.puntuacion",
+    "codificar_clave": "gabt.puntuacion",
+    "puntuar": "gabt.puntuacion",
+    "puntuar_sesion": "gabt.puntuacion",
+    "resultados_dataframe": "gabt.puntuacion",
+    "puntuar_adaptativo": "gabt.adaptativo",
+    "cargar_normas": "gabt.normas",
+    "leer_resultados": "gabt.exportacion",
+    "cargar_catalogo": "gabt.ocupaciones",
+    "BolsaTalento": "gabt.bolsa",
+    "RespuestasCompactas": "gabt.estado",
+    "ResultadosCompactos": "gabt.estado",
+    "generate_random_percentiles": "gabt.analisis",
+    "resultados_desde_percentiles": "gabt.analisis",
+    "get_analisis_detalle": "gabt.analisis",
+    "get_estrategias_de_mejora": "gabt.analisis",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(nombre):
+    modulo = _EXPORTS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module 'gabt' has no attribute {nombre!r}")
+    valor = getattr(import_module(modulo), nombre)
+    globals()[nombre] = valor
+    return valor
@@ -0,0 +1,124 @@
+"""Modo adaptativo (TAI): estimación de habilidad por área y selección de ítems por máxima información.
+
+Modelo logístico de 3 parámetros con parámetros por ítem en ``datos/parametros_irt.json``
+(o GABT_PARAMETROS_IRT). La habilidad se estima por EAP sobre una rejilla fija con
+prior normal estándar: las probabilidades de cada ítem en la rejilla se precalculan una
+vez, de modo que cada clic solo suma a lo sumo 12 filas de log-verosimilitud y evalúa la
+información de los ítems restantes (microsegundos). Un área termina cuando el error
+estándar baja de ``EE_OBJETIVO`` (con al menos ``MIN_ITEMS``) o se agota el área.
+
+El resultado del área es la puntuación verdadera estimada en el área completa
+(Σ P_i(θ) sobre sus ítems), que pasa por los mismos baremos que el test completo.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from gabt.aptitudes import AREAS
+from gabt.puntuacion import CODIGO_OPCION, codificar_clave, resultados_desde_brutas
+
+RUTA_PARAMETROS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos", "parametros_irt.json")
+FORMATO_PARAMETROS = 1
+EE_OBJETIVO = 0.55
+MIN_ITEMS = 3
+REJILLA = np.linspace(-4.0, 4.0, 81)
+LOG_PRIOR = -REJILLA ** 2 / 2
+
+
+@dataclass(frozen=True, eq=False)
+class BancoCalibrado:
+    """Parámetros 3PL alineados con la clave del banco y probabilidades precalculadas en la rejilla."""
+    version: str
+    a: np.ndarray
+    b: np.ndarray
+    c: np.ndarray
+    log_p: np.ndarray        # (n_ítems × rejilla) log P(acierto | θ)
+    log_q: np.ndarray        # (n_ítems × rejilla) log P(error | θ)
+    items_por_area: tuple    # posiciones de los ítems de cada área, en el orden de AREAS
+
+    def probabilidad(self, posiciones, theta):
+        """P(acierto) de los ítems indicados para una habilidad θ."""
+        a, b, c = self.a[posiciones], self.b[posiciones], self.c[posiciones]
+        return c + (1 - c) / (1 + np.exp(-a * (theta - b)))
+
+    def informacion(self, posiciones, theta):
+        """Información de Fisher 3PL de los ítems indicados en θ."""
+        p = self.probabilidad(posiciones, theta)
+        a, c = self.a[posiciones], self.c[posiciones]
+        return a ** 2 * ((p - c) / (1 - c)) ** 2 * (1 - p) / p
+
+
+@dataclass(frozen=True)
+class EstadoArea:
+    """Estimación vigente de un área y el siguiente ítem a presentar (None si el área terminó)."""
+    theta: float
+    error_estandar: float
+    administrados: int
+    siguiente: int = None
+
+    @property
+    def terminada(self):
+        return self.siguiente is None
+
+
+@lru_cache(maxsize=4)
+def cargar_parametros(banco, ruta=None):
+    """Carga (una vez por banco y ruta) los parámetros 3PL y precalcula sus probabilidades en la rejilla."""
+    ruta = ruta or os.environ.get("GABT_PARAMETROS_IRT") or RUTA_PARAMETROS
+    with open(ruta, encoding="utf-8") as f:
+        datos = json.load(f)
+    if datos.get("formato") != FORMATO_PARAMETROS:
+        raise ValueError(f"Formato de parámetros no soportado: {datos.get('formato')!r}")
+    clave = codificar_clave(banco)
+    faltantes = [q_id for q_id in clave.ids if str(q_id) not in datos["items"]]
+    if faltantes:
+        raise ValueError(f"Faltan parámetros para los ítems: {faltantes[:10]}")
+    parametros = np.array([[datos["items"][str(q_id)][k] for k in ("a", "b", "c")] for q_id in clave.ids])
+    a, b, c = (np.ascontiguousarray(parametros[:, j]) for j in range(3))
+    p = c[:, None] + (1 - c[:, None]) / (1 + np.exp(-a[:, None] * (REJILLA - b[:, None])))
+    items_por_area = tuple(np.flatnonzero(clave.area_por_item == i) for i in range(len(AREAS)))
+    for arr in (a, b, c, *items_por_area):
+        arr.flags.writeable = False
+    return BancoCalibrado(
+        version=datos["version"], a=a, b=b, c=c,
+        log_p=np.log(p), log_q=np.log1p(-p), items_por_area=items_por_area,
+    )
+
+
+def estimar_area(area, respuestas, banco, calibrado=None, ee_objetivo=EE_OBJETIVO, min_items=MIN_ITEMS):
+    """EAP de la habilidad en el área con las respuestas dadas (dict id -> letra) y siguiente ítem."""
+    calibrado = calibrado or cargar_parametros(banco)
+    clave = codificar_clave(banco)
+    posiciones = calibrado.items_por_area[AREAS.index(area)]
+    ids = [clave.ids[pos] for pos in posiciones]
+    dados = np.array([respuestas.get(q_id) is not None for q_id in ids])
+    administrados = posiciones[dados]
+    aciertos = np.array([CODIGO_OPCION.get(respuestas[clave.ids[pos]]) == clave.correctas[pos] for pos in administrados],
+                        dtype=bool)
+
+    log_post = LOG_PRIOR + calibrado.log_p[administrados[aciertos]].sum(axis=0) \
+        + calibrado.log_q[administrados[~aciertos]].sum(axis=0)
+    posterior = np.exp(log_post - log_post.max())
+    posterior /= posterior.sum()
+    theta = float(posterior @ REJILLA)
+    error = float(np.sqrt(posterior @ (REJILLA - theta) ** 2))
+
+    restantes = posiciones[~dados]
+    siguiente = None
+    if len(restantes) and (len(administrados) < min_items or error > ee_objetivo):
+        siguiente = clave.ids[restantes[np.argmax(calibrado.informacion(restantes, theta))]]
+    return EstadoArea(theta=theta, error_estandar=error, administrados=len(administrados), siguiente=siguiente)
+
+
+def puntuar_adaptativo(respuestas, banco, normas=None, calibrado=None):
+    """Resultados (ResultadosLote de una fila) de una sesión adaptativa: bruta = puntuación verdadera estimada."""
+    calibrado = calibrado or cargar_parametros(banco)
+    brutas = np.zeros((1, len(AREAS)), dtype=np.int64)
+    for i, area in enumerate(AREAS):
+        estado = estimar_area(area, respuestas, banco, calibrado)
+        brutas[0, i] = round(float(calibrado.probabilidad(calibrado.items_por_area[i], estado.theta).sum()))
+    return resultados_desde_brutas(brutas, codificar_clave(banco), normas)
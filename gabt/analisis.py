@@ -0,0 +1,147 @@
+"""Análisis del perfil: fortalezas, mejoras, potencial ocupacional y estrategias de desarrollo.
+
+Solo depende de la biblioteca estándar al importarse; pandas y numpy se cargan al usarse.
+"""
+
+import time
+
+from gabt.aptitudes import AREAS, N_PREGUNTAS_POR_AREA
+
+# Ocupaciones afines que se nombran en el informe
+OCUPACIONES_POR_INFORME = 3
+
+# Perfil simulado por defecto del informe rápido
+PERCENTILES_DEMO = {
+    "Razonamiento General": 85, "Razonamiento Verbal": 75, "Razonamiento Numérico": 80,
+    "Razonamiento Espacial": 65, "Velocidad Perceptiva": 50, "Precisión Manual": 40,
+    "Coordinación Manual": 30, "Atención Concentrada": 60, "Razonamiento Mecánico": 70,
+    "Razonamiento Abstracto": 88, "Razonamiento Clerical": 90, "Razonamiento Técnico": 55
+}
+
+# Mapeo de descripción de fortalezas
+DESCRIPCION_FORTALEZAS = {
+    "Razonamiento General": "abstracción, juicio lógico y resolución de problemas complejos.",
+    "Razonamiento Verbal": "comunicación ejecutiva, redacción de informes y comprensión de textos.",
+    "Razonamiento Numérico": "cálculo rápido, análisis cuantitativo y toma de decisiones financieras.",
+    "Razonamiento Espacial": "visualización 3D, lectura de planos y modelado conceptual.",
+    "Velocidad Perceptiva": "revisión rápida, control de calidad visual y cotejo de datos.",
+    "Precisión Manual": "manipulación fina, micro-ensamblaje y tareas que exigen detalle minucioso.",
+    "Coordinación Manual": "operación de maquinaria, conducción y sincronización ojo-mano-pie.",
+    "Atención Concentrada": "foco sostenido, resistencia a la distracción y auditoría de datos.",
+    "Razonamiento Mecánico": "diagnóstico de fallas en sistemas físicos y comprensión de principios de ingeniería.",
+    "Razonamiento Abstracto": "detección de patrones no verbales, pensamiento lateral e innovación.",
+    "Razonamiento Clerical": "organización, archivo, gestión documental y verificación de registros.",
+    "Razonamiento Técnico": "aplicación de conocimientos de electricidad, electrónica y mecánica.",
+}
+
+# Mapeo de descripción de mejoras
+DESCRIPCION_MEJORAS = {
+    "Razonamiento General": "el desarrollo de estrategias lógicas y análisis de inferencias.",
+    "Razonamiento Verbal": "la claridad, la estructura del lenguaje y la amplitud del vocabulario técnico.",
+    "Razonamiento Numérico": "la agilidad y precisión en el manejo de datos y problemas aritméticos.",
+    "Razonamiento Espacial": "la capacidad de rotación mental y la interpretación de diagramas.",
+    "Velocidad Perceptiva": "la eficiencia en la búsqueda y comparación de información detallada.",
+    "Precisión Manual": "la exactitud y el control motor fino en tareas de manipulación.",
+    "Coordinación Manual": "la sincronización entre los sentidos y los movimientos del cuerpo.",
+    "Atención Concentrada": "el mantenimiento del foco en tareas monótonas o de larga duración.",
+    "Razonamiento Mecánico": "la comprensión de sistemas de fuerza, movimiento y fluidos.",
+    "Razonamiento Abstracto": "la identificación de reglas subyacentes en patrones no figurativos.",
+    "Razonamiento Clerical": "la organización, el ordenamiento y la verificación de información alfanumérica.",
+    "Razonamiento Técnico": "la aplicación práctica de conocimientos de electricidad o instrumentación.",
+}
+
+ESTRATEGIAS_DE_MEJORA = {
+    "Razonamiento General": "Practicar juegos de lógica, resolver acertijos complejos y leer material de alta complejidad para expandir la capacidad de abstracción y juicio. **Aplicación:** Liderazgo estratégico y toma de decisiones complejas.",
+    "Razonamiento Verbal": "Ampliar el vocabulario con lectura activa y usar herramientas de redacción para estructurar ideas complejas en informes y correos. **Aplicación:** Comunicación ejecutiva y negociación.",
+    "Razonamiento Numérico": "Realizar ejercicios diarios de cálculo mental, practicar la resolución rápida de problemas aritméticos y familiarizarse con la interpretación de datos estadísticos. **Aplicación:** Análisis financiero y control presupuestario.",
+    "Razonamiento Espacial": "Usar aplicaciones o puzzles 3D para la rotación mental, practicar el dibujo técnico o la lectura de planos y mapas. **Aplicación:** Diseño, planeación arquitectónica y montaje.",
+    "Velocidad Perceptiva": "Entrenar con ejercicios de 'búsqueda y comparación' rápida de códigos, números y patrones en columnas. Ideal para la revisión de documentos. **Aplicación:** Revisión de contratos y control de calidad masivo.",
+    "Precisión Manual": "Realizar tareas que requieran manipulación fina, como el ensamblaje de modelos pequeños o la práctica de caligrafía y dibujo detallado. **Aplicación:** Cirugía, joyería y micro-ensamblaje.",
+    "Coordinación Manual": "Participar en actividades que sincronicen ojo-mano, como deportes con raqueta (tenis, ping pong), mecanografía rápida o el uso de software de dibujo. **Aplicación:** Operación de maquinaria compleja y manejo de vehículos.",
+    "Atención Concentrada": "Implementar la técnica Pomodoro o sesiones de enfoque ininterrumpido. Eliminar distracciones y practicar la revisión de textos largos buscando errores específicos. **Aplicación:** Tareas de auditoría y vigilancia.",
+    "Razonamiento Mecánico": "Estudiar diagramas de máquinas simples (palancas, poleas, engranajes) y leer libros sobre principios de física aplicada y mantenimiento industrial. **Aplicación:** Mantenimiento preventivo y diagnóstico de fallas mecánicas.",
+    "Razonamiento Abstracto": "Resolver secuencias de matrices figurativas (tipo Raven), puzzles no verbales y practicar el reconocimiento de patrones lógicos abstractos. **Aplicación:** Detección de tendencias y análisis predictivo sin datos numéricos.",
+    "Razonamiento Clerical": "Entrenar la organización y archivo de documentos. Practicar la clasificación rápida y la verificación cruzada de datos alfanuméricos. **Aplicación:** Gestión documental, archivo legal y tareas administrativas.",
+    "Razonamiento Técnico": "Analizar diagramas de flujo y resolución de problemas técnicos (troubleshooting) de sistemas conocidos (eléctricos, mecánicos, informáticos). **Aplicación:** Soporte técnico y resolución de problemas informáticos de primer nivel.",
+}
+
+
+def generate_random_percentiles():
+    """Genera un diccionario de percentiles aleatorios para simular un perfil variable."""
+    import numpy as np
+
+    random_percentiles = {}
+    # Usamos la hora actual como semilla para asegurar un perfil diferente en cada clic
+    np.random.seed(int(time.time() * 1000) % 2**32) 
+    for area in AREAS:
+        # Generar percentiles entre 30 y 95 para que el perfil sea "interesante" (no todo 5%)
+        percentil = np.random.randint(30, 95) 
+        random_percentiles[area] = percentil
+    return random_percentiles
+
+
+def resultados_desde_percentiles(percentiles_map=None):
+    """Construye el DataFrame de resultados a partir de un mapa de percentiles (aleatorio o fijo)."""
+    return resultados_compactos_desde_percentiles(percentiles_map).dataframe()
+
+
+def resultados_compactos_desde_percentiles(percentiles_map=None):
+    """Resultados compactos de sesión a partir de un mapa de percentiles (aleatorio o fijo)."""
+    from gabt.estado import ResultadosCompactos
+
+    # Si no se proporciona un mapa, usamos un perfil simulado por defecto
+    if percentiles_map is None:
+        percentiles_map = PERCENTILES_DEMO
+    return ResultadosCompactos.desde_percentiles(percentiles_map, N_PREGUNTAS_POR_AREA)
+
+
+def get_analisis_detalle(df_resultados):
+    """Genera un análisis detallado de las fortalezas y debilidades, y el potencial ocupacional."""
+    from gabt.ocupaciones import cargar_catalogo
+    
+    df_sorted = df_resultados.sort_values(by='Percentil', ascending=False)
+    
+    # Top 3 Fortalezas
+    top_3 = df_sorted.head(3)
+    fortalezas_text = "<ul>"
+    for area, percentil in zip(top_3['Área'], top_3['Percentil']):
+        key_application = DESCRIPCION_FORTALEZAS.get(area, "habilidades cognitivas generales.")
+        fortalezas_text += f"<li>**{area} ({percentil:.1f}%)**: Potencial alto para la **{key_application}**.</li>"
+    fortalezas_text += "</ul>"
+    
+    # Bottom 3 a Mejorar
+    bottom_3 = df_sorted.tail(3)
+    mejoras_text = "<ul>"
+    for area, percentil in zip(bottom_3['Área'], bottom_3['Percentil']):
+        improvement_focus = DESCRIPCION_MEJORAS.get(area, "la mejora de habilidades básicas.")
+        mejoras_text += f"<li>**{area} ({percentil:.1f}%)**: Requiere enfoque en **{improvement_focus}**.</li>"
+    mejoras_text += f"</ul>"
+
+    # Potencial Ocupacional: ajuste del perfil al catálogo de patrones ocupacionales
+    top_area = top_3.iloc[0]['Área']
+    catalogo = cargar_catalogo()
+    por_area = dict(zip(df_resultados['Área'], df_resultados['Percentil']))
+    percentiles = [por_area.get(area, 0) for area in AREAS]
+    ocupaciones = catalogo.ajustar(percentiles, k=OCUPACIONES_POR_INFORME).ocupaciones()
+    afines = [o for o in ocupaciones if o["cumple"]]
+    if afines:
+        nombres = [o["nombre"] for o in afines]
+        potencial = f"Roles como {', '.join(nombres[:-1])} y {nombres[-1]}." if len(nombres) > 1 else f"Roles como {nombres[0]}."
+        perfil = catalogo.perfiles_familias[catalogo.nombres_familias.index(afines[0]["familia"])]
+    else:
+        potencial = catalogo.sin_ajuste["potencial"]
+        perfil = catalogo.sin_ajuste["perfil"]
+
+    return {
+        "fortalezas": fortalezas_text,
+        "mejoras": mejoras_text,
+        "potencial": potencial,
+        "perfil": perfil,
+        "top_area": top_area,
+        "ocupaciones": ocupaciones,
+    }
+
+
+def get_estrategias_de_mejora(area):
+    """Proporciona estrategias de mejora específicas para cada área aptitudinal."""
+    return ESTRATEGIAS_DE_MEJORA.get(area, "Se recomienda entrenamiento específico en tareas de aplicación práctica.")
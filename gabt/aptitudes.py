@@ -0,0 +1,19 @@
+"""Definición de las 12 aptitudes evaluadas por la batería GABT."""
+
+# Mapeo de Aptitudes
+APTITUDES_MAP = {
+    "Razonamiento General": {"code": "G", "color": "#1f77b4"},
+    "Razonamiento Verbal": {"code": "V", "color": "#ff7f0e"},
+    "Razonamiento Numérico": {"code": "N", "color": "#2ca02c"},
+    "Razonamiento Espacial": {"code": "S", "color": "#d62728"},
+    "Velocidad Perceptiva": {"code": "P", "color": "#9467bd"},
+    "Precisión Manual": {"code": "Q", "color": "#8c564b"},
+    "Coordinación Manual": {"code": "K", "color": "#e377c2"},
+    "Atención Concentrada": {"code": "A", "color": "#7f7f7f"},
+    "Razonamiento Mecánico": {"code": "M", "color": "#bcbd22"},
+    "Razonamiento Abstracto": {"code": "R", "color": "#17becf"},
+    "Razonamiento Clerical": {"code": "C", "color": "#98df8a"},
+    "Razonamiento Técnico": {"code": "T", "color": "#ff9896"},
+}
+AREAS = list(APTITUDES_MAP.keys())
+N_PREGUNTAS_POR_AREA = 12
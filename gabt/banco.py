@@ -0,0 +1,326 @@
+"""Banco de preguntas GABT: archivo externo indexado, con carga perezosa por área y acceso de solo lectura.
+
+Los ítems viven en ``datos/banco/<forma>.<idioma>.jsonl`` (una línea JSON por ítem,
+agrupados por área) y ``datos/banco/indice.json`` guarda, por forma e idioma, la versión
+y para cada área el rango de bytes, los ids y la clave de respuestas. Al cargar un banco
+solo se lee el índice; los textos de un área se decodifican la primera vez que se usan.
+La clave completa sale del índice, así que puntuar no carga ningún texto.
+
+Tras editar un archivo de ítems se regenera el índice con::
+
+    python -m gabt.banco indexar [directorio]
+
+Un proceso que ya cargó el banco sigue usando el índice anterior hasta llamar a
+``invalidar_banco()`` (``indexar_directorio`` lo hace por sí mismo).
+
+Configuración por entorno: GABT_BANCO (directorio), GABT_FORMA y GABT_IDIOMA.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import threading
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
+from types import MappingProxyType
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.marcado import marcado_etiqueta, marcado_html
+
+# Se incrementa cuando cambia la forma de construir el banco (no su contenido,
+# que ya queda cubierto por el hash).
+FORMATO_BANCO = 1
+FORMATO_INDICE = 1
+DIRECTORIO_BANCO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos", "banco")
+ARCHIVO_INDICE = "indice.json"
+AREA_POR_CODIGO = {APTITUDES_MAP[area]["code"]: area for area in AREAS}
+
+
+@dataclass(frozen=True)
+class Pregunta:
+    """Ítem inmutable del banco."""
+    id: int
+    area: str
+    code: str
+    pregunta: str
+    opciones: MappingProxyType
+    respuesta_correcta: str
+
+
+@dataclass(frozen=True)
+class IndiceArea:
+    """Modelo de render precalculado de un área: ids, enunciados en HTML, etiquetas y mapas clave↔índice por ítem."""
+    area: str
+    code: str
+    ids: tuple
+    textos: tuple
+    html: tuple
+    correctas: tuple
+    etiquetas: tuple
+    indice_por_clave: tuple
+    clave_por_etiqueta: tuple
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def _indexar_area(area, preguntas):
+    """Construye el IndiceArea de las preguntas (ya ordenadas) de un área."""
+    etiquetas, indice_por_clave, clave_por_etiqueta = [], [], []
+    for p in preguntas:
+        # Formato de opciones: 'a) Respuesta A', con las fórmulas ya convertidas a texto
+        labels = tuple(f"{k}) {marcado_etiqueta(v)}" for k, v in p.opciones.items())
+        etiquetas.append(labels)
+        indice_por_clave.append(MappingProxyType({k: i for i, k in enumerate(p.opciones)}))
+        clave_por_etiqueta.append(MappingProxyType(dict(zip(labels, p.opciones))))
+    return IndiceArea(
+        area=area,
+        code=APTITUDES_MAP[area]["code"],
+        ids=tuple(p.id for p in preguntas),
+        textos=tuple(p.pregunta for p in preguntas),
+        html=tuple(marcado_html(p.pregunta) for p in preguntas),
+        correctas=tuple(p.respuesta_correcta for p in preguntas),
+        etiquetas=tuple(etiquetas),
+        indice_por_clave=tuple(indice_por_clave),
+        clave_por_etiqueta=tuple(clave_por_etiqueta),
+    )
+
+
+class _AreasPerezosas(Mapping):
+    """Mapa área -> IndiceArea que lee y decodifica cada área del archivo la primera vez que se pide."""
+
+    def __init__(self, ruta, rangos):
+        self._ruta = ruta
+        self._rangos = rangos
+        self._indices = {}
+        self._lock = threading.Lock()
+
+    def __getitem__(self, area):
+        indice = self._indices.get(area)
+        if indice is None:
+            inicio, fin = self._rangos[area]
+            with self._lock:
+                indice = self._indices.get(area)
+                if indice is None:
+                    indice = self._indices[area] = _indexar_area(area, _leer_preguntas(self._ruta, inicio, fin))
+        return indice
+
+    def __iter__(self):
+        return iter(self._rangos)
+
+    def __len__(self):
+        return len(self._rangos)
+
+    def precargar(self, area):
+        """Decodifica un área en un hilo de fondo (si aún no lo está) para que su primer uso no espere."""
+        if area in self._rangos and area not in self._indices:
+            threading.Thread(target=self.__getitem__, args=(area,), name="gabt-precarga", daemon=True).start()
+
+    def cargadas(self):
+        """Áreas ya decodificadas en este proceso."""
+        return tuple(self._indices)
+
+    def preguntas(self, area):
+        """Ítems completos de un área, leídos del archivo (sin memoizar)."""
+        return _leer_preguntas(self._ruta, *self._rangos[area])
+
+
+def _leer_preguntas(ruta, inicio, fin):
+    """Lee solo el rango de bytes de un área y decodifica sus ítems."""
+    with open(ruta, "rb") as f:
+        f.seek(inicio)
+        bloque = f.read(fin - inicio)
+    return [_pregunta(json.loads(linea)) for linea in bloque.decode("utf-8").splitlines() if linea.strip()]
+
+
+def _pregunta(q):
+    return Pregunta(
+        id=q["id"],
+        area=q["area"],
+        code=q["code"],
+        pregunta=q["pregunta"],
+        opciones=MappingProxyType(dict(q["opciones"])),
+        respuesta_correcta=q["respuesta_correcta"],
+    )
+
+
+@dataclass(frozen=True, eq=False)
+class BancoPreguntas:
+    """Banco de una forma e idioma, compartido entre todas las sesiones del proceso.
+
+    `ids`, `correctas` y `areas` (uno por ítem, en el orden de AREAS) salen del índice;
+    `por_area` decodifica cada área al primer acceso.
+    """
+    version: str
+    forma: str
+    idioma: str
+    ids: tuple
+    correctas: tuple
+    areas: tuple
+    por_area: Mapping
+
+    def __len__(self):
+        return len(self.ids)
+
+    @cached_property
+    def preguntas(self):
+        """Todos los ítems en el orden de AREAS (decodifica todas las áreas)."""
+        return tuple(p for area in self.por_area for p in self.por_area.preguntas(area))
+
+    @cached_property
+    def df(self):
+        """Vista DataFrame del banco (construida una sola vez; tratar como solo lectura)."""
+        import pandas as pd
+
+        return pd.DataFrame([
+            {
+                "id": p.id,
+                "area": p.area,
+                "code": p.code,
+                "pregunta": p.pregunta,
+                "opciones": dict(p.opciones),
+                "respuesta_correcta": p.respuesta_correcta,
+            }
+            for p in self.preguntas
+        ])
+
+
+def calcular_version(questions):
+    """Hash estable del contenido del banco, usado para invalidar cachés dependientes."""
+    payload = json.dumps(questions, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return f"v{FORMATO_BANCO}-{hashlib.sha256(payload).hexdigest()[:12]}"
+
+
+def indexar_archivo(ruta):
+    """Valida un archivo de ítems y devuelve su entrada de índice (versión y, por área, rango de bytes, ids y clave)."""
+    questions, rangos, vistos = [], {}, set()
+    area_actual = None
+    with open(ruta, "rb") as f:
+        posicion = 0
+        for numero, linea in enumerate(f, start=1):
+            inicio, posicion = posicion, posicion + len(linea)
+            if not linea.strip():
+                continue
+            q = json.loads(linea)
+            code = q.get("code")
+            if AREA_POR_CODIGO.get(code) != q.get("area"):
+                raise ValueError(f"{ruta}:{numero}: área desconocida {q.get('area')!r}/{code!r}")
+            if q["id"] in vistos:
+                raise ValueError(f"{ruta}:{numero}: id repetido {q['id']}")
+            if q["respuesta_correcta"] not in q["opciones"]:
+                raise ValueError(f"{ruta}:{numero}: la respuesta correcta no es una de las opciones")
+            if code != area_actual:
+                if code in rangos:
+                    raise ValueError(f"{ruta}:{numero}: los ítems del área {code} deben estar contiguos")
+                rangos[code] = {"inicio": inicio, "fin": inicio, "ids": [], "claves": ""}
+                area_actual = code
+            rango = rangos[code]
+            rango["fin"] = posicion
+            rango["ids"].append(q["id"])
+            rango["claves"] += q["respuesta_correcta"]
+            vistos.add(q["id"])
+            questions.append(q)
+    # Áreas en el orden de AREAS, como el resto del núcleo
+    orden = [APTITUDES_MAP[area]["code"] for area in AREAS if APTITUDES_MAP[area]["code"] in rangos]
+    questions.sort(key=lambda q: orden.index(q["code"]))
+    return {
+        "archivo": os.path.basename(ruta),
+        "version": calcular_version(questions),
+        "areas": {code: rangos[code] for code in orden},
+    }
+
+
+def indexar_directorio(directorio=DIRECTORIO_BANCO):
+    """Regenera el índice de todos los archivos '<forma>.<idioma>.jsonl' del directorio."""
+    formas = {}
+    for nombre in sorted(os.listdir(directorio)):
+        partes = nombre.split(".")
+        if len(partes) == 3 and partes[2] == "jsonl":
+            forma, idioma, _ = partes
+            formas.setdefault(forma, {})[idioma] = indexar_archivo(os.path.join(directorio, nombre))
+    if not formas:
+        raise ValueError(f"No hay archivos de ítems en {directorio}")
+    ruta_indice = os.path.join(directorio, ARCHIVO_INDICE)
+    por_defecto = {"forma": "general", "idioma": "es"}
+    if os.path.exists(ruta_indice):
+        with open(ruta_indice, encoding="utf-8") as f:
+            por_defecto = json.load(f).get("por_defecto", por_defecto)
+    indice = {"formato": FORMATO_INDICE, "por_defecto": por_defecto, "formas": formas}
+    with open(ruta_indice, "w", encoding="utf-8") as f:
+        json.dump(indice, f, ensure_ascii=False, separators=(",", ":"))
+        f.write("\n")
+    invalidar_banco()
+    return indice
+
+
+@lru_cache(maxsize=1)
+def _leer_indice(directorio):
+    with open(os.path.join(directorio, ARCHIVO_INDICE), encoding="utf-8") as f:
+        indice = json.load(f)
+    if indice.get("formato") != FORMATO_INDICE:
+        raise ValueError(f"Formato de índice de banco no soportado: {indice.get('formato')!r}")
+    return indice
+
+
+def invalidar_banco():
+    """Descarta el índice y los bancos cacheados: la próxima carga vuelve a leer ``indice.json``."""
+    _leer_indice.cache_clear()
+    cargar_banco.cache_clear()
+
+
+def generate_gatb_questions():
+    """Genera preguntas simuladas, corregidas y profesionales. (El detalle se omite por brevedad)"""
+    return cargar_banco().df.copy()
+
+
+@lru_cache(maxsize=4)
+def cargar_banco(forma=None, idioma=None):
+    """Abre el banco una única vez por proceso, forma e idioma (solo el índice). Usar `invalidar_banco()` para invalidarlo."""
+    directorio = os.environ.get("GABT_BANCO") or DIRECTORIO_BANCO
+    indice = _leer_indice(directorio)
+    forma = forma or os.environ.get("GABT_FORMA") or indice["por_defecto"]["forma"]
+    idioma = idioma or os.environ.get("GABT_IDIOMA") or indice["por_defecto"]["idioma"]
+    try:
+        entrada = indice["formas"][forma][idioma]
+    except KeyError:
+        raise ValueError(f"El banco no tiene la forma {forma!r} en idioma {idioma!r}") from None
+    ids, correctas, areas, rangos = [], [], [], {}
+    for code, rango in entrada["areas"].items():
+        area = AREA_POR_CODIGO[code]
+        ids += rango["ids"]
+        correctas += rango["claves"]
+        areas += [area] * len(rango["ids"])
+        rangos[area] = (rango["inicio"], rango["fin"])
+    return BancoPreguntas(
+        version=entrada["version"],
+        forma=forma,
+        idioma=idioma,
+        ids=tuple(ids),
+        correctas=tuple(correctas),
+        areas=tuple(areas),
+        por_area=_AreasPerezosas(os.path.join(directorio, entrada["archivo"]), rangos),
+    )
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Herramientas del banco de preguntas GABT.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    indexar = sub.add_parser("indexar", help="Valida los archivos de ítems y regenera el índice")
+    indexar.add_argument("directorio", nargs="?", default=DIRECTORIO_BANCO)
+    args = parser.parse_args(argv)
+
+    indice = indexar_directorio(args.directorio)
+    for forma, idiomas in indice["formas"].items():
+        for idioma, entrada in idiomas.items():
+            n = sum(len(r["ids"]) for r in entrada["areas"].values())
+            print(f"{forma}/{idioma}: {n} ítems, {len(entrada['areas'])} áreas, {entrada['version']}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
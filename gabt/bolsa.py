@@ -0,0 +1,402 @@
+"""Bolsa de talento en disco: percentiles de resultados pasados y búsqueda de los mejores candidatos para un rol.
+
+Uso:
+    python -m gabt.bolsa agregar gabt_bolsa gabt_exportacion        # importa lo exportado por la app
+    python -m gabt.bolsa agregar gabt_bolsa resultados.csv          # o una salida de gabt.lote
+    python -m gabt.bolsa niveles gabt_bolsa                         # (re)construye los mapas de bits
+    python -m gabt.bolsa buscar gabt_bolsa --minimos G=80,N=70 -k 20
+    python -m gabt.bolsa buscar gabt_bolsa --ocupacion analista-de-datos
+
+Archivos del directorio de la bolsa:
+
+    bolsa.json          metadatos: filas confirmadas, ancho de id, últimos archivos importados
+                        (los de gabt.exportacion por ruta relativa, los CSV por ruta, tamaño y
+                        fecha), progreso del CSV en curso, índice de ids, mapas de bits
+    percentiles.u2      matriz (filas × 12 áreas) uint16 en décimas de percentil, por filas
+    ids.bin             id de cada fila, ancho fijo (``ancho_id`` bytes, rellenado con ceros)
+    ids-ordenados-<n>.npy  los ids de las primeras n filas, ordenados
+    niveles-<n>.npy     opcional: por área y corte de ``UMBRALES_PERCENTIL``, un mapa de bits
+                        (áreas × cortes × bytes) de las filas con clasificación (``clasificar_percentiles``) en ese nivel o más
+
+Las matrices se abren por mapeo de memoria, así que una búsqueda recorre la bolsa en
+bloques sin cargarla en RAM. Las filas se añaden al final y solo cuentan cuando
+``bolsa.json`` (reemplazado de forma atómica) las confirma: un lector nunca ve una
+importación a medias. Se admite un solo escritor a la vez.
+
+Cada candidato entra una sola vez: ``agregar`` descarta los ids que ya están en la bolsa
+(se conserva la primera importación) buscándolos en ``ids-ordenados-<n>.npy`` y, para las
+filas añadidas después, en la cola de ``ids.bin``; el índice se reconstruye cuando esa
+cola crece. Así, volver a importar un archivo regenerado solo añade sus candidatos nuevos
+y la lista de archivos importados es solo un atajo acotado para no releerlos.
+
+Una búsqueda pide un percentil mínimo por área (como los patrones de ``gabt.ocupaciones``):
+filtra a los candidatos que cumplen todos los mínimos y los ordena por su percentil
+promedio en esas áreas. Los bloques se reparten entre hilos y cada uno guarda su top-k.
+Con mapas de bits, cada bloque se descarta o se reduce a sus filas posibles leyendo solo
+los bits de las áreas exigidas; las filas añadidas después del último índice se recorren
+completas.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.puntuacion import UMBRALES_PERCENTIL, clasificar_percentiles
+
+CODIGOS = tuple(APTITUDES_MAP[area]["code"] for area in AREAS)
+FORMATO_BOLSA = 1
+ARCHIVO_META = "bolsa.json"
+ARCHIVO_PERCENTILES = "percentiles.u2"
+ARCHIVO_IDS = "ids.bin"
+DTYPE_PERCENTILES = np.dtype("<u2")
+# Filas por bloque de búsqueda (múltiplo de 8, para que cada bloque empiece en un byte de los mapas de bits)
+FILAS_POR_BLOQUE = 1 << 16
+# Por encima de esta fracción de filas posibles, leer el bloque entero sale más barato que saltar filas
+DENSIDAD_MAXIMA = 0.25
+# Filas fuera del índice de ids toleradas antes de reconstruirlo (o un cuarto de las indexadas, si es más)
+COLA_IDS = 1 << 16
+# Archivos recordados en meta["importados"]; los más antiguos se olvidan (releerlos no duplica candidatos)
+MAX_IMPORTADOS = 4096
+
+
+class BolsaTalento:
+    """Bolsa de talento en un directorio: matriz de percentiles por mapeo de memoria, ids y mapas de bits."""
+
+    def __init__(self, directorio, ancho_id=32):
+        self.directorio = directorio
+        ruta_meta = os.path.join(directorio, ARCHIVO_META)
+        if os.path.exists(ruta_meta):
+            with open(ruta_meta, encoding="utf-8") as f:
+                self.meta = json.load(f)
+            if self.meta.get("formato") != FORMATO_BOLSA:
+                raise ValueError(f"Formato de bolsa no soportado: {self.meta.get('formato')!r}")
+        else:
+            self.meta = {"formato": FORMATO_BOLSA, "filas": 0, "ancho_id": ancho_id, "importados": [],
+                         "csv_en_curso": None, "ids_ordenados": None, "niveles": None}
+
+    def __len__(self):
+        return self.meta["filas"]
+
+    def _ruta(self, nombre):
+        return os.path.join(self.directorio, nombre)
+
+    def _guardar_meta(self):
+        temporal = self._ruta(f".{ARCHIVO_META}.tmp")
+        with open(temporal, "w", encoding="utf-8") as f:
+            json.dump(self.meta, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self._ruta(ARCHIVO_META))
+
+    def matriz(self):
+        """Percentiles confirmados (filas × áreas, décimas) como mapeo de memoria de solo lectura."""
+        if not len(self):
+            return np.zeros((0, len(AREAS)), dtype=DTYPE_PERCENTILES)
+        return np.memmap(self._ruta(ARCHIVO_PERCENTILES), dtype=DTYPE_PERCENTILES, mode="r",
+                         shape=(len(self), len(AREAS)))
+
+    def ids(self, filas):
+        """Ids de las filas indicadas (solo se leen esas posiciones del archivo)."""
+        if not len(self):
+            return []
+        tabla = np.memmap(self._ruta(ARCHIVO_IDS), dtype=f"S{self.meta['ancho_id']}", mode="r", shape=(len(self),))
+        return [valor.decode("utf-8") for valor in tabla[np.asarray(filas, dtype=np.int64)]]
+
+    def _ids_ordenados(self):
+        indice = self.meta.get("ids_ordenados")
+        if not indice:
+            return np.zeros(0, dtype=f"S{self.meta['ancho_id']}"), 0
+        return np.load(self._ruta(indice["archivo"]), mmap_mode="r"), indice["filas"]
+
+    def _nuevos(self, codificados):
+        """Máscara de los ids (bytes de ancho fijo) que no están en la bolsa ni aparecen antes en el mismo lote."""
+        nuevos = np.zeros(len(codificados), dtype=bool)
+        nuevos[np.unique(codificados, return_index=True)[1]] = True
+        ordenados, indexadas = self._ids_ordenados()
+        if len(ordenados):
+            posiciones = np.minimum(np.searchsorted(ordenados, codificados), len(ordenados) - 1)
+            nuevos &= ordenados[posiciones] != codificados
+        if len(self) > indexadas:
+            cola = np.memmap(self._ruta(ARCHIVO_IDS), dtype=codificados.dtype, mode="r",
+                             offset=indexadas * codificados.dtype.itemsize, shape=(len(self) - indexadas,))
+            nuevos &= ~np.isin(codificados, cola)
+        return nuevos
+
+    def _indexar_ids(self, filas):
+        """Escribe ordenados los ids de las primeras `filas` filas; queda confirmado con los metadatos."""
+        dtype = f"S{self.meta['ancho_id']}"
+        nombre = f"ids-ordenados-{filas}.npy"
+        temporal = self._ruta(f".{nombre}.tmp")
+        with open(temporal, "wb") as f:
+            np.save(f, np.sort(np.memmap(self._ruta(ARCHIVO_IDS), dtype=dtype, mode="r", shape=(filas,))))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporal, self._ruta(nombre))
+        self.meta["ids_ordenados"] = {"archivo": nombre, "filas": filas}
+
+    def agregar(self, ids, percentiles):
+        """Añade candidatos (ids y percentiles n × áreas en el orden de AREAS) y los confirma en los metadatos.
+
+        Los ids que ya están en la bolsa, o repetidos dentro del lote, se omiten; devuelve
+        el número de candidatos añadidos.
+        """
+        percentiles = np.asarray(percentiles, dtype=np.float64)
+        if percentiles.ndim != 2 or percentiles.shape[1] != len(AREAS) or len(ids) != len(percentiles):
+            raise ValueError(f"Se esperaban {len(ids)} filas de {len(AREAS)} percentiles, no {percentiles.shape}")
+        codificados = np.array([str(i).encode("utf-8") for i in ids], dtype=object)
+        ancho = self.meta["ancho_id"]
+        if any(len(valor) > ancho for valor in codificados):
+            raise ValueError(f"Hay ids de más de {ancho} bytes")
+        codificados = codificados.astype(f"S{ancho}")
+        nuevos = self._nuevos(codificados)
+        decimas = np.round(np.clip(np.nan_to_num(percentiles[nuevos]), 0, 100) * 10).astype(DTYPE_PERCENTILES)
+        os.makedirs(self.directorio, exist_ok=True)
+        filas = len(self)
+        # Una importación interrumpida pudo dejar filas sin confirmar al final: se descartan
+        for nombre, ancho_fila, datos in ((ARCHIVO_PERCENTILES, len(AREAS) * DTYPE_PERCENTILES.itemsize, decimas),
+                                          (ARCHIVO_IDS, ancho, codificados[nuevos])):
+            with open(self._ruta(nombre), "ab") as f:
+                f.truncate(filas * ancho_fila)
+                f.write(np.ascontiguousarray(datos).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+        self.meta["filas"] = filas + len(decimas)
+        anterior = self.meta.get("ids_ordenados")
+        indexadas = anterior["filas"] if anterior else 0
+        if self.meta["filas"] - indexadas > max(COLA_IDS, indexadas // 4):
+            self._indexar_ids(self.meta["filas"])
+        self._guardar_meta()
+        if anterior and anterior != self.meta["ids_ordenados"] and os.path.exists(self._ruta(anterior["archivo"])):
+            os.remove(self._ruta(anterior["archivo"]))
+        return len(decimas)
+
+    def indexar_niveles(self):
+        """(Re)construye los mapas de bits por área y corte de todas las filas confirmadas."""
+        n = len(self)
+        if not n:
+            return
+        matriz = self.matriz()
+        nombre = f"niveles-{n}.npy"
+        temporal = self._ruta(f".{nombre}.tmp")
+        niveles = np.lib.format.open_memmap(temporal, mode="w+", dtype=np.uint8,
+                                            shape=(len(AREAS), len(UMBRALES_PERCENTIL), (n + 7) // 8))
+        for inicio in range(0, n, FILAS_POR_BLOQUE):
+            clases = clasificar_percentiles(matriz[inicio:inicio + FILAS_POR_BLOQUE].T / 10)
+            for corte in range(len(UMBRALES_PERCENTIL)):
+                niveles[:, corte, inicio // 8:(inicio + len(clases.T) + 7) // 8] = \
+                    np.packbits(clases > corte, axis=1)
+        niveles.flush()
+        del niveles
+        os.replace(temporal, self._ruta(nombre))
+        anterior = self.meta["niveles"]
+        self.meta["niveles"] = {"archivo": nombre, "filas": n}
+        self._guardar_meta()
+        # Los lectores que aún lo tengan mapeado lo conservan hasta cerrarlo
+        if anterior and anterior["archivo"] != nombre and os.path.exists(self._ruta(anterior["archivo"])):
+            os.remove(self._ruta(anterior["archivo"]))
+
+    def _niveles(self):
+        if not self.meta["niveles"]:
+            return None, 0
+        indice = self.meta["niveles"]
+        return np.load(self._ruta(indice["archivo"]), mmap_mode="r"), indice["filas"]
+
+    def buscar(self, minimos, k=10, hilos=None, usar_niveles=True):
+        """Los k mejores candidatos que cumplen los mínimos ({código: percentil}), de mejor a peor."""
+        if not minimos:
+            raise ValueError("La búsqueda debe exigir un mínimo en al menos un área")
+        desconocidos = set(minimos) - set(CODIGOS)
+        if desconocidos:
+            raise ValueError(f"Códigos de área inválidos en los mínimos: {sorted(desconocidos)}")
+        columnas = np.array([CODIGOS.index(code) for code in minimos])
+        cortes = np.array([round(minimo * 10) for minimo in minimos.values()], dtype=np.int32)
+        # Cada mínimo cae en un nivel de clasificación; quien lo cumple está en ese nivel o más
+        filtros = [(a, int(nivel) - 1) for a, nivel in zip(columnas, clasificar_percentiles(list(minimos.values())))
+                   if nivel > 0]
+        niveles, filas_indexadas = self._niveles() if usar_niveles and filtros else (None, 0)
+
+        matriz = self.matriz()
+        bloques = list(range(0, len(self), FILAS_POR_BLOQUE))
+        hilos = max(1, min(hilos or os.cpu_count() or 1, len(bloques)))
+        repartos = [bloques[i::hilos] for i in range(hilos)]
+
+        def escanear(inicios):
+            filas_top, puntos_top = [], []
+            for inicio in inicios:
+                fin = min(inicio + FILAS_POR_BLOQUE, len(self))
+                filas = None
+                if niveles is not None and fin <= filas_indexadas:
+                    bits = niveles[filtros[0][0], filtros[0][1], inicio // 8:(fin + 7) // 8].copy()
+                    for a, corte in filtros[1:]:
+                        bits &= niveles[a, corte, inicio // 8:(fin + 7) // 8]
+                    if not bits.any():
+                        continue
+                    posibles = np.flatnonzero(np.unpackbits(bits, count=fin - inicio))
+                    if len(posibles) <= DENSIDAD_MAXIMA * (fin - inicio):
+                        filas = posibles + inicio
+                bloque = (matriz[filas] if filas is not None else matriz[inicio:fin])[:, columnas]
+                cumple = (bloque >= cortes).all(axis=1)
+                if not cumple.any():
+                    continue
+                puntos = bloque[cumple].sum(axis=1, dtype=np.int32)
+                indices = filas[cumple] if filas is not None else np.flatnonzero(cumple) + inicio
+                if len(puntos) > k:
+                    # Se conservan todos los empatados con el k-ésimo y se desempata por fila, como al final
+                    umbral = np.partition(puntos, len(puntos) - k)[len(puntos) - k]
+                    empatados = np.flatnonzero(puntos >= umbral)
+                    mejores = empatados[np.lexsort((indices[empatados], -puntos[empatados]))[:k]]
+                    puntos, indices = puntos[mejores], indices[mejores]
+                filas_top.append(indices)
+                puntos_top.append(puntos)
+            return filas_top, puntos_top
+
+        filas_top, puntos_top = [], []
+        with ThreadPoolExecutor(max_workers=hilos, thread_name_prefix="gabt-bolsa") as pool:
+            for filas_hilo, puntos_hilo in pool.map(escanear, repartos):
+                filas_top += filas_hilo
+                puntos_top += puntos_hilo
+        if not filas_top:
+            return []
+        filas = np.concatenate(filas_top)
+        puntos = np.concatenate(puntos_top)
+        # Mayor puntaje primero; a igual puntaje, el candidato más antiguo (orden determinista)
+        orden = np.lexsort((filas, -puntos))[:k]
+        filas, puntos = filas[orden], puntos[orden]
+        percentiles = matriz[filas] / 10
+        return [
+            {"id": id_, "afinidad": round(float(p) / len(columnas) / 10, 1),
+             **{code: float(percentiles[j, c]) for code, c in zip(minimos, columnas)}}
+            for j, (id_, p) in enumerate(zip(self.ids(filas), puntos))
+        ]
+
+    def _recordar(self, clave):
+        self.meta["importados"].append(clave)
+        del self.meta["importados"][:-MAX_IMPORTADOS]
+
+    def importar_exportacion(self, directorio, desde=None, hasta=None):
+        """Añade los archivos de gabt.exportacion aún no importados; devuelve el número de candidatos nuevos."""
+        from gabt.exportacion import archivos_resultados, leer_archivo
+
+        importados = set(self.meta["importados"])
+        total = 0
+        for relativa in archivos_resultados(directorio, desde, hasta):
+            if relativa in importados:
+                continue
+            tabla = leer_archivo(os.path.join(directorio, relativa))
+            percentiles = np.column_stack([tabla.column(f"percentil_{code}").to_numpy() for code in CODIGOS])
+            # El archivo y sus filas se confirman juntos en los metadatos
+            self._recordar(relativa)
+            try:
+                total += self.agregar(tabla.column("token").to_pylist(), percentiles)
+            except Exception:
+                self.meta["importados"].pop()
+                raise
+        return total
+
+    def importar_csv(self, ruta, columna_id="candidato", tamano_bloque=100000):
+        """Añade una salida de gabt.lote (columnas ``<código>_percentil``) leída en bloques.
+
+        Un archivo ya importado (misma ruta, tamaño y fecha de modificación) no se relee; si
+        cambió, se relee y solo se añaden sus candidatos nuevos. Cada bloque se confirma junto
+        con las filas leídas del archivo, así que una importación interrumpida continúa donde
+        quedó.
+        """
+        import pandas as pd
+
+        estado = os.stat(ruta)
+        clave = f"{os.path.abspath(ruta)}|{estado.st_size}|{estado.st_mtime_ns}"
+        if clave in self.meta["importados"]:
+            return 0
+        en_curso = self.meta.get("csv_en_curso") or {}
+        leidas = en_curso["filas"] if en_curso.get("clave") == clave else 0
+        columnas = [f"{code}_percentil" for code in CODIGOS]
+        total = 0
+        for bloque in pd.read_csv(ruta, usecols=[columna_id] + columnas, dtype={columna_id: str},
+                                  chunksize=tamano_bloque, skiprows=range(1, leidas + 1)):
+            anterior = self.meta.get("csv_en_curso")
+            self.meta["csv_en_curso"] = {"clave": clave, "filas": leidas + len(bloque)}
+            try:
+                total += self.agregar(bloque[columna_id].tolist(), bloque[columnas].to_numpy())
+            except Exception:
+                self.meta["csv_en_curso"] = anterior
+                raise
+            leidas += len(bloque)
+        self.meta["csv_en_curso"] = None
+        # Una sola entrada por ruta: la de su última versión importada
+        ruta_abs = clave.rsplit("|", 2)[0]
+        self.meta["importados"] = [i for i in self.meta["importados"] if i.rsplit("|", 2)[0] != ruta_abs]
+        self._recordar(clave)
+        self._guardar_meta()
+        return total
+
+
+def _minimos(texto):
+    """Mínimos por área a partir de ``G=80,N=70``."""
+    minimos = {}
+    for par in texto.split(","):
+        code, _, valor = par.partition("=")
+        minimos[code.strip().upper()] = float(valor)
+    return minimos
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Bolsa de talento GABT: importación y búsqueda por requisitos de rol.")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+    agregar = comandos.add_parser("agregar", help="Importa resultados a la bolsa")
+    agregar.add_argument("bolsa", help="Directorio de la bolsa")
+    agregar.add_argument("origen", help="Directorio de gabt.exportacion o salida .csv de gabt.lote")
+    agregar.add_argument("--columna-id", default="candidato", help="Columna con el id del candidato (CSV)")
+    agregar.add_argument("--desde", help="Primer día (AAAA-MM-DD) a importar de la exportación")
+    agregar.add_argument("--hasta", help="Último día (AAAA-MM-DD) a importar de la exportación")
+    agregar.add_argument("--niveles", action="store_true", help="Reconstruye los mapas de bits al terminar")
+    niveles = comandos.add_parser("niveles", help="(Re)construye los mapas de bits por área y nivel")
+    niveles.add_argument("bolsa", help="Directorio de la bolsa")
+    buscar = comandos.add_parser("buscar", help="Los mejores candidatos para unos requisitos")
+    buscar.add_argument("bolsa", help="Directorio de la bolsa")
+    requisitos = buscar.add_mutually_exclusive_group(required=True)
+    requisitos.add_argument("--minimos", type=_minimos, help="Percentil mínimo por código de área, p. ej. G=80,N=70")
+    requisitos.add_argument("--ocupacion", help="Id de una ocupación del catálogo de gabt.ocupaciones")
+    buscar.add_argument("-k", type=int, default=10, help="Candidatos a devolver")
+    buscar.add_argument("--hilos", type=int, default=None, help="Hilos de búsqueda (por defecto, uno por CPU)")
+    buscar.add_argument("--sin-niveles", action="store_true", help="No usa los mapas de bits")
+    args = parser.parse_args(argv)
+
+    bolsa = BolsaTalento(args.bolsa)
+    if args.comando == "agregar":
+        if os.path.isdir(args.origen):
+            nuevos = bolsa.importar_exportacion(args.origen, args.desde, args.hasta)
+        else:
+            nuevos = bolsa.importar_csv(args.origen, args.columna_id)
+        if args.niveles:
+            bolsa.indexar_niveles()
+        print(f"{nuevos} candidatos añadidos ({len(bolsa)} en la bolsa) -> {args.bolsa}", file=sys.stderr)
+    elif args.comando == "niveles":
+        bolsa.indexar_niveles()
+        print(f"Mapas de bits de {len(bolsa)} candidatos -> {args.bolsa}", file=sys.stderr)
+    else:
+        minimos = args.minimos
+        if args.ocupacion:
+            from gabt.ocupaciones import cargar_catalogo
+
+            catalogo = cargar_catalogo()
+            if args.ocupacion not in catalogo.ids:
+                parser.error(f"Ocupación desconocida: {args.ocupacion}")
+            fila = catalogo.minimos[catalogo.ids.index(args.ocupacion)]
+            minimos = {code: float(m) for code, m in zip(CODIGOS, fila) if np.isfinite(m)}
+        inicio = time.perf_counter()
+        encontrados = bolsa.buscar(minimos, args.k, args.hilos, not args.sin_niveles)
+        print(json.dumps(encontrados, ensure_ascii=False, indent=2))
+        print(f"{len(encontrados)} de {len(bolsa)} candidatos en {(time.perf_counter() - inicio) * 1000:.0f} ms",
+              file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""Calibración de baremos por flujo: recalcula las tablas normativas a partir de resultados archivados.
+
+Uso:
+    python -m gabt.calibracion resultados*.csv --boceto boceto.json --salida normas.json
+
+La entrada son archivos de resultados como los que escribe ``gabt.lote`` (CSV o JSONL
+con columnas ``<code>_bruta``). Como las puntuaciones brutas son enteros acotados, el
+boceto de cuantiles es un histograma exacto de conteos por (grupo, área, puntaje): ocupa
+memoria constante sin importar el número de candidatos y dos bocetos se combinan
+sumándolos. Cada bloque (o shard, con ``--combinar``) produce un boceto parcial.
+
+Con ``--boceto`` el histograma acumulado se lee, se actualiza y se vuelve a guardar, de
+modo que la actualización nocturna solo procesa los resultados nuevos. El grupo
+"general" cuenta a todos los candidatos; ``--columna-grupo`` añade además el grupo
+normativo de cada uno.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from itertools import chain
+
+import numpy as np
+import pandas as pd
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.lote import bloques_crudos, procesar
+from gabt.normas import FORMATO_NORMAS, GRUPO_GENERAL, construir_normas
+from gabt.puntuacion import UMBRALES_PERCENTIL
+
+FORMATO_BOCETO = 1
+MUESTRA_MINIMA = 100  # Candidatos por grupo y área para publicar su tabla
+COLUMNAS_BRUTAS = tuple(f"{APTITUDES_MAP[area]['code']}_bruta" for area in AREAS)
+
+
+@dataclass(eq=False)
+class Boceto:
+    """Histograma de puntuaciones brutas por (grupo, área, puntaje): boceto de cuantiles exacto y combinable."""
+    grupos: list = field(default_factory=lambda: [GRUPO_GENERAL])
+    conteos: np.ndarray = field(default_factory=lambda: np.zeros((1, len(AREAS), 1), dtype=np.int64))
+
+    def _indice(self, nombre):
+        """Índice del grupo, agregándolo (con conteos en cero) si es nuevo."""
+        if nombre not in self.grupos:
+            self.grupos.append(nombre)
+            self.conteos = np.concatenate([self.conteos, np.zeros_like(self.conteos[:1])])
+        return self.grupos.index(nombre)
+
+    def _ampliar(self, ancho):
+        """Extiende el eje de puntajes hasta `ancho` columnas."""
+        if ancho > self.conteos.shape[2]:
+            extra = np.zeros(self.conteos.shape[:2] + (ancho - self.conteos.shape[2],), dtype=np.int64)
+            self.conteos = np.concatenate([self.conteos, extra], axis=2)
+
+    def agregar(self, brutas, grupos=None):
+        """Suma una matriz (n × n_áreas) de puntuaciones brutas; los valores negativos se ignoran."""
+        brutas = np.atleast_2d(np.asarray(brutas, dtype=np.int64))
+        if brutas.size == 0:
+            return self
+        self._ampliar(int(brutas.max()) + 1)
+        n_areas, ancho = self.conteos.shape[1:]
+        validas = brutas >= 0
+        celdas = np.arange(n_areas) * ancho + brutas
+        planos = [celdas[validas]]
+        if grupos is not None:
+            nombres, inversa = np.unique(np.asarray(grupos, dtype=object).astype(str), return_inverse=True)
+            indices = np.array([-1 if n in ("", "None", "nan", GRUPO_GENERAL) else self._indice(n) for n in nombres])
+            por_fila = indices[inversa.reshape(-1)].reshape(-1, 1)
+            con_grupo = validas & (por_fila >= 0)
+            planos.append((por_fila * n_areas * ancho + celdas)[con_grupo])
+        self.conteos += np.bincount(np.concatenate(planos), minlength=self.conteos.size).reshape(self.conteos.shape)
+        return self
+
+    def combinar(self, otro):
+        """Suma otro boceto (de otro bloque o shard) a este."""
+        indices = [self._indice(nombre) for nombre in otro.grupos]
+        self._ampliar(otro.conteos.shape[2])
+        self.conteos[indices, :, :otro.conteos.shape[2]] += otro.conteos
+        return self
+
+    def muestra(self, grupo=GRUPO_GENERAL):
+        """Candidatos por área en el grupo."""
+        return self.conteos[self.grupos.index(grupo)].sum(axis=1)
+
+    def rangos_percentiles(self, grupo=GRUPO_GENERAL):
+        """Rango percentil de punto medio de cada puntaje: 100 · (debajo + mitad de los iguales) / n, por área."""
+        conteos = self.conteos[self.grupos.index(grupo)].astype(np.float64)
+        debajo = np.cumsum(conteos, axis=1) - conteos
+        n = np.maximum(conteos.sum(axis=1, keepdims=True), 1)
+        return (debajo + conteos / 2) / n * 100
+
+    def cuantiles(self, percentiles, grupo=GRUPO_GENERAL):
+        """Puntaje bruto por área que alcanza cada percentil (matriz n_áreas × len(percentiles))."""
+        acumulado = np.cumsum(self.conteos[self.grupos.index(grupo)], axis=1)
+        objetivo = acumulado[:, -1:] * (np.asarray(percentiles, dtype=np.float64) / 100)
+        return np.array([np.searchsorted(fila, meta, side="left") for fila, meta in zip(acumulado, objetivo)])
+
+    def tabla_normas(self, version, minimo=MUESTRA_MINIMA, descripcion=None):
+        """Documento de baremos (formato de gabt.normas); se omiten las tablas con muestra insuficiente."""
+        grupos = {}
+        for grupo in self.grupos:
+            muestra = self.muestra(grupo)
+            rangos = self.rangos_percentiles(grupo)
+            tablas = {}
+            for a, area in enumerate(AREAS):
+                if muestra[a] >= minimo:
+                    tablas[APTITUDES_MAP[area]["code"]] = {
+                        "puntajes": list(range(rangos.shape[1])),
+                        "percentiles": [round(float(p), 1) for p in rangos[a]],
+                        "muestra": int(muestra[a]),
+                    }
+            if tablas:
+                grupos[grupo] = tablas
+        if len(grupos.get(GRUPO_GENERAL, {})) < len(AREAS):
+            raise ValueError(f"Muestra insuficiente en el grupo general (mínimo {minimo} por área)")
+        datos = {"formato": FORMATO_NORMAS, "version": version, "grupos": grupos}
+        if descripcion:
+            datos["descripcion"] = descripcion
+        construir_normas(datos)  # Valida antes de publicar
+        return datos
+
+    def a_dict(self):
+        return {"formato": FORMATO_BOCETO, "grupos": list(self.grupos), "conteos": self.conteos.tolist()}
+
+
+def boceto_desde_dict(datos):
+    """Reconstruye un boceto guardado con Boceto.a_dict."""
+    if datos.get("formato") != FORMATO_BOCETO:
+        raise ValueError(f"Formato de boceto no soportado: {datos.get('formato')!r}")
+    conteos = np.asarray(datos["conteos"], dtype=np.int64)
+    if datos["grupos"][0] != GRUPO_GENERAL or conteos.shape[:2] != (len(datos["grupos"]), len(AREAS)):
+        raise ValueError("Boceto inconsistente con las áreas de la batería")
+    return Boceto(grupos=list(datos["grupos"]), conteos=conteos)
+
+
+def cargar_boceto(ruta):
+    with open(ruta, encoding="utf-8") as f:
+        return boceto_desde_dict(json.load(f))
+
+
+def escribir_json(datos, ruta):
+    """Escribe JSON de forma atómica (archivo temporal + reemplazo), para no dejar archivos a medias."""
+    temporal = f"{ruta}.tmp"
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+    os.replace(temporal, ruta)
+
+
+def _boceto_bloque(tarea):
+    """Tarea de un worker: lee las columnas de puntuación bruta de un bloque y devuelve su boceto parcial."""
+    formato, cabecera, lineas, columna_grupo = tarea
+    if formato == "csv":
+        bloque = pd.read_csv(io.StringIO(cabecera + "".join(linea for _, linea in lineas)),
+                             dtype=object, keep_default_na=False)
+    else:
+        bloque = pd.DataFrame.from_records([json.loads(linea) for _, linea in lineas])
+    faltantes = [c for c in COLUMNAS_BRUTAS if c not in bloque.columns]
+    if faltantes:
+        raise ValueError(f"Faltan columnas de puntuación bruta: {', '.join(faltantes)}")
+    brutas = bloque[list(COLUMNAS_BRUTAS)].apply(pd.to_numeric, errors="coerce").fillna(-1).to_numpy(np.int64)
+    grupos = bloque[columna_grupo].to_numpy(dtype=object) if columna_grupo in bloque.columns else None
+    return Boceto().agregar(brutas, grupos)
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Calibra los baremos GABT a partir de resultados archivados.")
+    parser.add_argument("entradas", nargs="*", help="Archivos de resultados (.csv o .jsonl) con columnas <code>_bruta")
+    parser.add_argument("--boceto", help="Boceto acumulado: se lee si existe y se guarda actualizado")
+    parser.add_argument("--combinar", nargs="*", default=[], help="Bocetos parciales de otros shards")
+    parser.add_argument("--salida", help="Archivo de baremos a escribir (formato de gabt.normas)")
+    parser.add_argument("--version", default=time.strftime("%Y.%m.%d"), help="Versión del baremo emitido")
+    parser.add_argument("--minimo", type=int, default=MUESTRA_MINIMA, help="Muestra mínima por grupo y área")
+    parser.add_argument("--columna-grupo", default=None, help="Columna/campo con el grupo normativo")
+    parser.add_argument("--bloque", type=int, default=50000, help="Filas por bloque (memoria acotada)")
+    parser.add_argument("--procesos", type=int, default=1, help="Número de procesos de lectura")
+    args = parser.parse_args(argv)
+
+    boceto = cargar_boceto(args.boceto) if args.boceto and os.path.exists(args.boceto) else Boceto()
+    for ruta in args.combinar:
+        boceto.combinar(cargar_boceto(ruta))
+    tareas = (
+        (formato, cabecera, lineas, args.columna_grupo)
+        for formato, cabecera, lineas in chain.from_iterable(bloques_crudos(r, args.bloque) for r in args.entradas)
+    )
+    for parcial in procesar(tareas, args.procesos, funcion=_boceto_bloque):
+        boceto.combinar(parcial)
+    if args.boceto:
+        escribir_json(boceto.a_dict(), args.boceto)
+
+    print(f"Muestra general: {int(boceto.muestra().max())} candidatos; grupos: {', '.join(boceto.grupos)}",
+          file=sys.stderr)
+    cortes = boceto.cuantiles(UMBRALES_PERCENTIL)
+    for a, area in enumerate(AREAS):
+        print(f"  {APTITUDES_MAP[area]['code']} puntajes en P{'/'.join(map(str, UMBRALES_PERCENTIL))}: "
+              f"{'/'.join(map(str, cortes[a]))}", file=sys.stderr)
+    if args.salida:
+        escribir_json(boceto.tabla_normas(args.version, args.minimo), args.salida)
+        print(f"Baremo {args.version} -> {args.salida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
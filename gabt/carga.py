@@ -0,0 +1,176 @@
+"""Prueba de carga: candidatos sintéticos recorriendo la app real, con percentiles de latencia por rerun.
+
+Uso:
+    python -m gabt.carga --candidatos 40 --concurrencia 1,4,8 --pausa 0.2 --salida carga.json
+
+Cada candidato es una sesión de ``streamlit.testing`` (AppTest) sobre ``mn.py`` que hace
+el recorrido completo: inicio → 12 secciones respondiendo ítem a ítem (radio o, en modo
+adaptativo, radio + confirmar) y avanzando con el botón de sección → informe. Las
+sesiones corren en hilos del mismo proceso, que comparten cachés, banco y almacenes
+como en un servidor real. AppTest no admite reruns simultáneos (cada uno instala y al
+terminar retira un Runtime global), así que los reruns de las sesiones se turnan con un
+candado y su latencia incluye la espera, como la cola de un servidor cuyos reruns
+compiten por el GIL; las pausas de reflexión sí transcurren en paralelo. Para cada nivel de concurrencia se informan los percentiles
+p50/p95/p99 de la latencia de rerun, la CPU del proceso por candidato y la memoria
+residente al terminar el nivel.
+
+Los almacenes (sesiones, agregados, exportación) se crean en un directorio temporal
+salvo que las variables GABT_* correspondientes ya estén definidas; el modo del test
+se toma de GABT_MODO_TEST como en la app.
+"""
+
+import argparse
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+RUTA_APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mn.py")
+TITULO_INFORME = "Informe Ejecutivo"
+MAX_PASOS = 1000
+_log = logging.getLogger(__name__)
+# Un rerun de AppTest a la vez en el proceso (ver el docstring del módulo)
+_turno_rerun = threading.Lock()
+
+
+def rss_mb():
+    """Memoria residente actual del proceso en MB (el pico si /proc no está disponible)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _boton(at, *textos):
+    return next((b for b in at.button if any(t in b.label for t in textos)), None)
+
+
+def _compartir_bytecode():
+    """Hace que todas las sesiones de AppTest usen una sola ScriptCache, como las de un servidor real.
+
+    AppTest crea una caché por rerun, así que recompilaría ``mn.py`` en cada clic (inflando
+    la latencia). Reemplaza el nombre ``ScriptCache`` en dos módulos internos de ``streamlit.testing``
+    (probado con la versión fijada en requirements.txt); si no existen, cada sesión
+    conserva sus propias cachés y se avisa en el log. Devuelve si la caché se comparte.
+    """
+    try:
+        from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+        from streamlit.testing.v1 import app_test, local_script_runner
+    except ImportError:
+        modulos = ()
+    else:
+        modulos = (app_test, local_script_runner)
+    if not modulos or not all(hasattr(modulo, "ScriptCache") for modulo in modulos):
+        _log.warning("Esta versión de Streamlit no permite compartir la ScriptCache de AppTest: cada sesión "
+                     "compila mn.py en cada rerun y la latencia medida incluye esa compilación")
+        return False
+    compartida = ScriptCache()
+    for modulo in modulos:
+        modulo.ScriptCache = lambda: compartida
+    return True
+
+
+def candidato(semilla, pausa=0.0, ruta_app=RUTA_APP, timeout=60):
+    """Recorre la app con un candidato sintético y devuelve las latencias (s) de cada rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(semilla)
+    latencias = []
+
+    def medir(accion):
+        inicio = time.perf_counter()
+        with _turno_rerun:
+            accion.run()
+        latencias.append(time.perf_counter() - inicio)
+        if at.exception:
+            raise RuntimeError(f"Excepción en la app: {at.exception[0].message}")
+
+    at = AppTest.from_file(ruta_app, default_timeout=timeout)
+    at.query_params["campana"] = "carga"
+    medir(at)
+    medir(_boton(at, "Iniciar Evaluación").click())
+    for _ in range(MAX_PASOS):
+        if at.title and TITULO_INFORME in at.title[0].value:
+            return latencias
+        if pausa:
+            time.sleep(rng.uniform(0.5, 1.5) * pausa)
+        confirmar = _boton(at, "Confirmar Respuesta")
+        pendiente = next((r for r in at.radio if r.value is None), None)
+        if pendiente is not None:
+            medir(pendiente.set_value(rng.choice(pendiente.options)))
+            # Modo adaptativo: el botón de confirmar se habilita con el rerun de la selección
+            if confirmar is not None:
+                medir(_boton(at, "Confirmar Respuesta").click())
+        else:
+            medir(_boton(at, "Siguiente Sección", "Finalizar Test").click())
+    raise RuntimeError(f"El candidato {semilla} no llegó al informe en {MAX_PASOS} pasos")
+
+
+def nivel(concurrencia, candidatos, pausa=0.0, semilla=0):
+    """Corre `candidatos` sesiones con `concurrencia` simultáneas y resume latencias, CPU y memoria."""
+    cpu_inicio, inicio = time.process_time(), time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrencia, thread_name_prefix="gabt-carga") as pool:
+        por_candidato = list(pool.map(lambda i: candidato(semilla + i, pausa), range(candidatos)))
+    duracion = time.perf_counter() - inicio
+    latencias = np.concatenate([np.asarray(lat) for lat in por_candidato]) * 1000
+    p50, p95, p99 = np.percentile(latencias, [50, 95, 99])
+    return {
+        "sesiones": concurrencia,
+        "candidatos": candidatos,
+        "reruns": int(latencias.size),
+        "p50_ms": round(float(p50), 1),
+        "p95_ms": round(float(p95), 1),
+        "p99_ms": round(float(p99), 1),
+        "max_ms": round(float(latencias.max()), 1),
+        "reruns_por_s": round(latencias.size / duracion, 1),
+        "cpu_s_por_candidato": round((time.process_time() - cpu_inicio) / candidatos, 3),
+        "rss_mb": round(rss_mb(), 1),
+        "hilos": threading.active_count(),
+    }
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Prueba de carga de la app GABT con candidatos sintéticos.")
+    parser.add_argument("--candidatos", type=int, default=8, help="Candidatos por nivel de concurrencia")
+    parser.add_argument("--concurrencia", default="1,4", help="Niveles de sesiones simultáneas, separados por comas")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Tiempo medio de reflexión entre clics (s)")
+    parser.add_argument("--semilla", type=int, default=0, help="Semilla de las respuestas aleatorias")
+    parser.add_argument("--salida", help="Archivo JSON con los resultados (para comparar entre versiones)")
+    args = parser.parse_args(argv)
+
+    directorio = tempfile.mkdtemp(prefix="gabt-carga-")
+    os.environ.setdefault("GABT_SESIONES_DB", os.path.join(directorio, "sesiones.db"))
+    os.environ.setdefault("GABT_AGREGADOS_DB", os.path.join(directorio, "agregados.db"))
+    os.environ.setdefault("GABT_EXPORTACION", os.path.join(directorio, "exportacion"))
+
+    _compartir_bytecode()
+    # Un candidato de calentamiento: importaciones, banco y cachés no cuentan en el primer nivel
+    candidato(-1)
+    niveles = []
+    for concurrencia in (int(c) for c in args.concurrencia.split(",")):
+        resumen = nivel(concurrencia, args.candidatos, args.pausa, args.semilla)
+        niveles.append(resumen)
+        print(f"{resumen['sesiones']:>3} sesiones: {resumen['reruns']} reruns · p50 {resumen['p50_ms']} ms · "
+              f"p95 {resumen['p95_ms']} ms · p99 {resumen['p99_ms']} ms · {resumen['reruns_por_s']} reruns/s · "
+              f"CPU {resumen['cpu_s_por_candidato']} s/candidato · RSS {resumen['rss_mb']} MB", file=sys.stderr)
+
+    print(f"Almacenes de la prueba en {directorio}", file=sys.stderr)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            json.dump({"modo": os.environ.get("GABT_MODO_TEST", "completo"), "pausa": args.pausa, "niveles": niveles},
+                      f, ensure_ascii=False, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
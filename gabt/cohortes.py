@@ -0,0 +1,271 @@
+"""Agregados de cohortes: histogramas por campaña, día y área actualizados al llegar cada resultado.
+
+Cada resultado suma en la tabla ``agregados`` una fila por área (intervalo de percentil
+de 1 punto) y una por calificación global; las consultas del panel solo suman esas
+filas (a lo sumo ~1.200 por campaña y día), sin volver a leer resultados individuales.
+La app no escribe en el camino de la interfaz: ``encolar`` suma el resultado a un agregado
+pendiente en memoria (por campaña y día) y un hilo de fondo lo vuelca cada ``intervalo``
+segundos en una transacción. Si el volcado falla, lo pendiente se conserva, el error se
+registra con ``logging`` y se reintenta con espera exponencial. ``registrar`` escribe de
+forma síncrona (para gabt.lote). Configuración por entorno:
+
+    GABT_AGREGADOS_DB   ruta del archivo SQLite (por defecto 'gabt_agregados.db')
+"""
+
+import atexit
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.puntuacion import CALIFICACIONES_GLOBALES
+
+_log = logging.getLogger(__name__)
+CAMPANA_POR_DEFECTO = "sin-campana"
+DIMENSION_GLOBAL = "global"
+N_INTERVALOS = 101  # Percentiles 0..100 en intervalos de 1 punto
+# Espera máxima (s) entre reintentos de un volcado fallido
+ESPERA_MAXIMA = 60.0
+CODIGOS = tuple(APTITUDES_MAP[area]["code"] for area in AREAS)
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS agregados (
+    campana TEXT NOT NULL,
+    dia TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    clave INTEGER NOT NULL,
+    n INTEGER NOT NULL,
+    suma REAL NOT NULL,
+    PRIMARY KEY (campana, dia, dimension, clave)
+) WITHOUT ROWID;
+"""
+
+
+def hoy():
+    """Día (UTC, ISO 8601) con el que se agregan los resultados."""
+    return time.strftime("%Y-%m-%d", time.gmtime())
+
+
+@dataclass(eq=False)
+class Agregado:
+    """Conteos y sumas de percentiles de una cohorte; dos agregados se combinan sumándolos."""
+    conteos_areas: np.ndarray = field(default_factory=lambda: np.zeros((len(AREAS), N_INTERVALOS), dtype=np.int64))
+    sumas_areas: np.ndarray = field(default_factory=lambda: np.zeros((len(AREAS), N_INTERVALOS)))
+    conteos_globales: np.ndarray = field(default_factory=lambda: np.zeros(len(CALIFICACIONES_GLOBALES), dtype=np.int64))
+    sumas_globales: np.ndarray = field(default_factory=lambda: np.zeros(len(CALIFICACIONES_GLOBALES)))
+
+    @classmethod
+    def desde_resultados(cls, resultados):
+        """Agrega un ResultadosLote (n candidatos) con un bincount por dimensión."""
+        percentiles = resultados.percentiles
+        intervalos = np.clip(np.floor(percentiles), 0, N_INTERVALOS - 1).astype(np.int64)
+        plano = (np.arange(len(AREAS)) * N_INTERVALOS + intervalos).ravel()
+        tamano = len(AREAS) * N_INTERVALOS
+        calificaciones = resultados.calificaciones.astype(np.int64)
+        n_global = len(CALIFICACIONES_GLOBALES)
+        return cls(
+            conteos_areas=np.bincount(plano, minlength=tamano).reshape(len(AREAS), N_INTERVALOS),
+            sumas_areas=np.bincount(plano, weights=percentiles.ravel(), minlength=tamano).reshape(len(AREAS), N_INTERVALOS),
+            conteos_globales=np.bincount(calificaciones, minlength=n_global),
+            sumas_globales=np.bincount(calificaciones, weights=resultados.percentil_promedio, minlength=n_global),
+        )
+
+    def combinar(self, otro):
+        """Suma otro agregado (de otro bloque, día o campaña) a este."""
+        self.conteos_areas += otro.conteos_areas
+        self.sumas_areas += otro.sumas_areas
+        self.conteos_globales += otro.conteos_globales
+        self.sumas_globales += otro.sumas_globales
+        return self
+
+    def filas(self):
+        """Filas (dimensión, clave, n, suma) no vacías, para guardar en la tabla de agregados."""
+        for a, code in enumerate(CODIGOS):
+            for clave in np.flatnonzero(self.conteos_areas[a]):
+                yield code, int(clave), int(self.conteos_areas[a, clave]), float(self.sumas_areas[a, clave])
+        for clave in np.flatnonzero(self.conteos_globales):
+            yield DIMENSION_GLOBAL, int(clave), int(self.conteos_globales[clave]), float(self.sumas_globales[clave])
+
+    @property
+    def n(self):
+        return int(self.conteos_globales.sum())
+
+    @property
+    def percentil_promedio(self):
+        return float(self.sumas_globales.sum() / max(self.n, 1))
+
+    def promedio_por_area(self):
+        """Percentil medio exacto de cada área (en el orden de AREAS)."""
+        return self.sumas_areas.sum(axis=1) / np.maximum(self.conteos_areas.sum(axis=1), 1)
+
+    def tabla_areas(self):
+        """DataFrame de áreas ordenado de mayor a menor percentil medio."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Área": AREAS,
+            "Código": CODIGOS,
+            "Percentil Medio": np.round(self.promedio_por_area(), 1),
+        }).sort_values("Percentil Medio", ascending=False, ignore_index=True)
+
+    def tabla_calificaciones(self):
+        """DataFrame con los candidatos y el porcentaje de la cohorte en cada calificación global."""
+        import pandas as pd
+
+        return pd.DataFrame({
+            "Calificación": [titulo for titulo, _, _ in CALIFICACIONES_GLOBALES],
+            "Candidatos": self.conteos_globales,
+            "% de la Cohorte": np.round(self.conteos_globales / max(self.n, 1) * 100, 1),
+        })
+
+    def distribucion(self, code, ancho=10):
+        """Candidatos por intervalo de percentil (de `ancho` puntos) en un área, como Serie indexada por rango."""
+        import pandas as pd
+
+        conteos = self.conteos_areas[CODIGOS.index(code)]
+        inicios = np.arange(0, N_INTERVALOS, ancho)
+        finales = np.minimum(inicios + ancho, N_INTERVALOS) - 1
+        etiquetas = [f"{i}-{f}" if f > i else str(i) for i, f in zip(inicios, finales)]
+        return pd.Series(np.add.reduceat(conteos, inicios), index=etiquetas, name="Candidatos")
+
+
+class AlmacenAgregados:
+    """Tabla de agregados en SQLite (WAL): cada volcado es una sola transacción de upserts."""
+
+    def __init__(self, ruta, intervalo=2.0):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self._conn = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(ESQUEMA)
+        self._lock = threading.Lock()
+        # _pendientes: {(campaña, día): Agregado} aún no volcado; lo protege _lock_pendientes
+        self._pendientes = {}
+        self._lock_pendientes = threading.Lock()
+        self._parada = threading.Event()
+        self._hilo = None
+        self._cerrado = False
+        self.fallos = 0  # Volcados fallidos (cada uno se reintenta)
+
+    def _escribir(self, pendientes):
+        filas = [(campana, dia, *fila) for (campana, dia), agregado in pendientes.items() for fila in agregado.filas()]
+        with self._lock:
+            try:
+                self._conn.execute("BEGIN")
+                self._conn.executemany(
+                    "INSERT INTO agregados (campana, dia, dimension, clave, n, suma) VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(campana, dia, dimension, clave) DO UPDATE SET "
+                    "n = n + excluded.n, suma = suma + excluded.suma",
+                    filas,
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                if self._conn.in_transaction:
+                    self._conn.execute("ROLLBACK")
+                raise
+
+    def registrar(self, campana, agregado, dia=None):
+        """Suma un agregado (de uno o muchos resultados) a los contadores de la campaña y el día, ya mismo."""
+        self._escribir({(campana, dia or hoy()): agregado})
+
+    def encolar(self, campana, agregado, dia=None):
+        """Suma un agregado a lo pendiente de la campaña y el día; no toca el disco ni lanza errores de E/S."""
+        with self._lock_pendientes:
+            if self._cerrado:
+                return
+            pendiente = self._pendientes.get((campana, dia or hoy()))
+            if pendiente is None:
+                self._pendientes[(campana, dia or hoy())] = Agregado().combinar(agregado)
+            else:
+                pendiente.combinar(agregado)
+            if self._hilo is None:
+                self._hilo = threading.Thread(target=self._bucle, name="gabt-agregados-flush", daemon=True)
+                self._hilo.start()
+                atexit.register(self.cerrar)
+
+    def flush(self):
+        """Vuelca lo pendiente en una transacción; si falla, lo devuelve a lo pendiente y relanza."""
+        with self._lock_pendientes:
+            pendientes, self._pendientes = self._pendientes, {}
+        if not pendientes:
+            return
+        try:
+            self._escribir(pendientes)
+        except Exception:
+            self.fallos += 1
+            with self._lock_pendientes:
+                for clave, agregado in self._pendientes.items():
+                    pendientes[clave] = pendientes[clave].combinar(agregado) if clave in pendientes else agregado
+                self._pendientes = pendientes
+            raise
+
+    def _bucle(self):
+        espera = self.intervalo
+        while not self._parada.wait(self.intervalo):
+            try:
+                self.flush()
+            except Exception:
+                _log.exception("No se pudieron volcar los agregados de cohortes; se reintenta en %.1f s", espera)
+                if self._parada.wait(espera):
+                    break
+                espera = min(espera * 2, ESPERA_MAXIMA)
+            else:
+                espera = self.intervalo
+
+    def campanas(self):
+        """Lista de (campaña, candidatos, primer día, último día), de la más reciente a la más antigua."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT campana, SUM(n), MIN(dia), MAX(dia) FROM agregados WHERE dimension = ? "
+                "GROUP BY campana ORDER BY MAX(dia) DESC, campana",
+                (DIMENSION_GLOBAL,),
+            ).fetchall()
+
+    def consultar(self, campana, desde=None, hasta=None):
+        """Agregado de una campaña entre dos días (inclusive), sumando las filas precalculadas."""
+        with self._lock:
+            filas = self._conn.execute(
+                "SELECT dimension, clave, SUM(n), SUM(suma) FROM agregados "
+                "WHERE campana = ? AND dia BETWEEN ? AND ? GROUP BY dimension, clave",
+                (campana, desde or "0000-00-00", hasta or "9999-99-99"),
+            ).fetchall()
+        agregado = Agregado()
+        for dimension, clave, n, suma in filas:
+            if dimension == DIMENSION_GLOBAL:
+                agregado.conteos_globales[clave] = n
+                agregado.sumas_globales[clave] = suma
+            elif dimension in CODIGOS:
+                a = CODIGOS.index(dimension)
+                agregado.conteos_areas[a, clave] = n
+                agregado.sumas_areas[a, clave] = suma
+        return agregado
+
+    def cerrar(self):
+        """Vuelca lo pendiente (registrando el error si falla) y cierra la conexión."""
+        with self._lock_pendientes:
+            if self._cerrado:
+                return
+            self._cerrado = True
+        self._parada.set()
+        if self._hilo is not None:
+            self._hilo.join()
+        try:
+            self.flush()
+        except Exception:
+            _log.exception("Se perdieron agregados de cohortes pendientes al cerrar")
+        with self._lock:
+            self._conn.close()
+
+
+@lru_cache(maxsize=1)
+def obtener_agregados():
+    """Almacén de agregados compartido por todo el proceso."""
+    return AlmacenAgregados(os.environ.get("GABT_AGREGADOS_DB", "gabt_agregados.db"))
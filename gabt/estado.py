@@ -0,0 +1,143 @@
+"""Estado compacto de una sesión: respuestas empaquetadas en bits y puntuaciones por área en un arreglo fijo.
+
+Una sesión inactiva guarda unos pocos cientos de bytes en lugar de un dict de 144
+entradas y un DataFrame: los textos (nombres, códigos, colores, clasificaciones) salen
+de las tablas compartidas del núcleo y el DataFrame solo se construye como vista
+cuando una página lo necesita.
+"""
+
+from collections.abc import MutableMapping
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.puntuacion import CLASIFICACIONES, CODIGO_OPCION, OPCIONES, SIN_RESPUESTA, clasificar_percentiles
+
+# Puntuaciones por área: bruta y máximo en 2 bytes (bancos de hasta 65.535 ítems por área);
+# porcentaje y percentil en décimas
+DTYPE_PUNTUACIONES = np.dtype([("bruta", "<u2"), ("maximo", "<u2"), ("porcentaje", "<u2"), ("percentil", "<u2")])
+_MAXIMO_ITEMS = np.iinfo(DTYPE_PUNTUACIONES["maximo"]).max
+_DESPLAZAMIENTOS = np.array([0, 2, 4, 6], dtype=np.uint8)
+
+
+class RespuestasCompactas(MutableMapping):
+    """Respuestas {id_pregunta: 'a'..'d'} con 2 bits por opción y 1 bit de «respondida» por ítem.
+
+    Las posiciones de los ítems se comparten con la clave codificada del banco; ``version``
+    identifica el banco con el que se construyeron.
+    """
+
+    __slots__ = ("version", "_ids", "_posicion", "_opciones", "_respondidas")
+
+    def __init__(self, clave, respuestas=None):
+        self.version = clave.version
+        self._ids = clave.ids
+        self._posicion = clave.posicion
+        self._opciones = bytearray((len(clave.ids) + 3) // 4)
+        self._respondidas = bytearray((len(clave.ids) + 7) // 8)
+        if respuestas:
+            self.update(respuestas)
+
+    def _pos(self, q_id):
+        try:
+            return self._posicion[int(q_id)]
+        except (KeyError, TypeError, ValueError):
+            raise KeyError(q_id) from None
+
+    def __getitem__(self, q_id):
+        pos = self._pos(q_id)
+        if not self._respondidas[pos >> 3] >> (pos & 7) & 1:
+            raise KeyError(q_id)
+        return OPCIONES[self._opciones[pos >> 2] >> ((pos & 3) * 2) & 3]
+
+    def __setitem__(self, q_id, opcion):
+        pos = self._pos(q_id)
+        desplazamiento = (pos & 3) * 2
+        self._opciones[pos >> 2] = self._opciones[pos >> 2] & ~(3 << desplazamiento) | CODIGO_OPCION[opcion] << desplazamiento
+        self._respondidas[pos >> 3] |= 1 << (pos & 7)
+
+    def __delitem__(self, q_id):
+        pos = self._pos(q_id)
+        if not self._respondidas[pos >> 3] >> (pos & 7) & 1:
+            raise KeyError(q_id)
+        self._respondidas[pos >> 3] &= ~(1 << (pos & 7))
+
+    def __iter__(self):
+        for pos in np.flatnonzero(self._mascara()):
+            yield self._ids[pos]
+
+    def __len__(self):
+        return sum(byte.bit_count() for byte in self._respondidas)
+
+    def clear(self):
+        self._respondidas[:] = bytes(len(self._respondidas))
+
+    def _mascara(self):
+        bits = np.unpackbits(np.frombuffer(self._respondidas, dtype=np.uint8), bitorder="little")
+        return bits[:len(self._ids)].astype(bool)
+
+    def codigos(self):
+        """Vector int8 de respuestas codificadas (como codificar_respuestas), sin pasar por un dict."""
+        opciones = (np.frombuffer(self._opciones, dtype=np.uint8)[:, None] >> _DESPLAZAMIENTOS) & 3
+        return np.where(self._mascara(), opciones.ravel()[:len(self._ids)], SIN_RESPUESTA).astype(np.int8)
+
+
+class ResultadosCompactos:
+    """Puntuaciones por área de una sesión (en el orden de AREAS) en un solo arreglo estructurado."""
+
+    __slots__ = ("puntuaciones",)
+
+    def __init__(self, puntuaciones):
+        self.puntuaciones = puntuaciones
+
+    @classmethod
+    def _desde_columnas(cls, brutas, maximos, porcentajes, percentiles):
+        if np.max(maximos) > _MAXIMO_ITEMS:
+            raise ValueError(f"Áreas con más de {_MAXIMO_ITEMS} ítems no caben en ResultadosCompactos")
+        puntuaciones = np.zeros(len(AREAS), dtype=DTYPE_PUNTUACIONES)
+        puntuaciones["bruta"] = brutas
+        puntuaciones["maximo"] = maximos
+        puntuaciones["porcentaje"] = np.round(np.asarray(porcentajes, dtype=np.float64) * 10)
+        puntuaciones["percentil"] = np.round(np.asarray(percentiles, dtype=np.float64) * 10)
+        return cls(puntuaciones)
+
+    @classmethod
+    def desde_resultados(cls, resultados, fila=0):
+        """Toma la fila de un ResultadosLote."""
+        return cls._desde_columnas(resultados.brutas[fila], resultados.maximos, resultados.porcentajes[fila],
+                                   resultados.percentiles[fila])
+
+    @classmethod
+    def desde_percentiles(cls, percentiles_map, n_preguntas):
+        """Perfil simulado: bruta estimada y porcentaje igual al percentil de cada área."""
+        percentiles = np.array([float(percentiles_map[area]) for area in AREAS])
+        return cls._desde_columnas(np.round(percentiles / 100 * n_preguntas), n_preguntas, percentiles, percentiles)
+
+    @classmethod
+    def desde_registros(cls, registros):
+        """Reconstruye los resultados desde los registros guardados (una fila por área, columnas del informe)."""
+        por_area = {r["Área"]: r for r in registros}
+        return cls._desde_columnas(*(
+            [por_area[area][columna] for area in AREAS]
+            for columna in ("Puntuación Bruta", "Máxima Puntuación", "Porcentaje (%)", "Percentil")
+        ))
+
+    @property
+    def percentiles(self):
+        return self.puntuaciones["percentil"] / 10
+
+    def dataframe(self):
+        """Vista DataFrame con las columnas del informe (se construye en cada llamada; no se guarda en la sesión)."""
+        import pandas as pd
+
+        percentiles = self.percentiles
+        return pd.DataFrame({
+            "Área": AREAS,
+            "Código": [APTITUDES_MAP[area]["code"] for area in AREAS],
+            "Puntuación Bruta": self.puntuaciones["bruta"].astype(int),
+            "Máxima Puntuación": self.puntuaciones["maximo"].astype(int),
+            "Porcentaje (%)": self.puntuaciones["porcentaje"] / 10,
+            "Percentil": percentiles,
+            "Clasificación": [CLASIFICACIONES[c][1] for c in clasificar_percentiles(percentiles)],
+            "Color": [APTITUDES_MAP[area]["color"] for area in AREAS],
+        })
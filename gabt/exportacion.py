@@ -0,0 +1,216 @@
+"""Exportación asíncrona de resultados a archivos Arrow IPC particionados por día.
+
+Cada test terminado se encola en memoria (``enviar`` nunca espera al disco) y un hilo de
+fondo escribe los resultados en lotes: un archivo por lote en
+``<directorio>/dia=AAAA-MM-DD/``, con una fila por candidato y columnas por área.
+La cola está acotada; si se llena (disco lento o caído), los resultados nuevos se
+descartan y se cuentan en ``descartados`` en lugar de bloquear la interfaz. Un lote que
+no se puede escribir se registra en el log, se descarta y suma uno a ``fallos``. Al
+cerrar el proceso se vuelca lo pendiente.
+
+Los archivos son Arrow IPC sin compresión, de modo que ``leer_resultados`` los abre
+por mapeo de memoria (sin copiar). Configuración por entorno:
+
+    GABT_EXPORTACION   directorio de salida (por defecto 'gabt_exportacion'; 'no' la desactiva)
+
+Requiere ``pyarrow``, que solo se importa en el hilo escritor y al leer.
+"""
+
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from functools import lru_cache
+from itertools import count
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.puntuacion import CALIFICACIONES_GLOBALES, calificar_global_lote
+
+_log = logging.getLogger(__name__)
+
+CODIGOS = tuple(APTITUDES_MAP[area]["code"] for area in AREAS)
+_FIN = object()
+
+
+def _esquema():
+    import pyarrow as pa
+
+    campos = [
+        ("token", pa.string()),
+        ("campana", pa.string()),
+        ("modo", pa.string()),
+        ("banco_version", pa.string()),
+        ("completado", pa.timestamp("ms", tz="UTC")),
+    ]
+    campos += [(f"bruta_{code}", pa.uint16()) for code in CODIGOS]
+    campos += [(f"percentil_{code}", pa.float32()) for code in CODIGOS]
+    campos += [
+        ("percentil_promedio", pa.float32()),
+        ("calificacion", pa.dictionary(pa.int8(), pa.string())),
+    ]
+    return pa.schema(campos)
+
+
+class ExportadorResultados:
+    """Cola acotada de resultados y un hilo que la vuelca en lotes a archivos Arrow particionados por día."""
+
+    def __init__(self, directorio, tamano_lote=500, intervalo=5.0, max_cola=10000):
+        self.directorio = directorio
+        self.tamano_lote = tamano_lote
+        self.intervalo = intervalo
+        self.descartados = 0
+        self.escritos = 0
+        self.fallos = 0
+        self._cola = queue.Queue(maxsize=max_cola)
+        self._secuencia = count()
+        self._cerrado = False
+        self._hilo = threading.Thread(target=self._bucle, name="gabt-exportacion", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    def enviar(self, token, campana, resultados, modo, banco_version):
+        """Encola los resultados (ResultadosCompactos) de un test terminado; no bloquea."""
+        if self._cerrado:
+            return False
+        try:
+            self._cola.put_nowait((token, campana, modo, banco_version, time.time(), resultados.puntuaciones.copy()))
+        except queue.Full:
+            self.descartados += 1
+            return False
+        return True
+
+    def _bucle(self):
+        fin = False
+        while not fin:
+            lote = []
+            limite = time.monotonic() + self.intervalo
+            while len(lote) < self.tamano_lote:
+                try:
+                    elemento = self._cola.get(timeout=max(limite - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if elemento is _FIN:
+                    fin = True
+                    self._cola.task_done()
+                    break
+                lote.append(elemento)
+            if lote:
+                try:
+                    self._escribir(lote)
+                except Exception:  # Un fallo de disco no debe detener el hilo
+                    self.descartados += len(lote)
+                    self.fallos += 1
+                    _log.exception("No se pudo escribir un lote de %d resultados", len(lote))
+                for _ in lote:
+                    self._cola.task_done()
+
+    def _escribir(self, lote):
+        """Escribe un lote, agrupado por día de finalización, con un archivo nuevo por partición."""
+        dias = [time.strftime("%Y-%m-%d", time.gmtime(elemento[4])) for elemento in lote]
+        for dia in sorted(set(dias)):
+            filas = [elemento for elemento, d in zip(lote, dias) if d == dia]
+            particion = os.path.join(self.directorio, f"dia={dia}")
+            os.makedirs(particion, exist_ok=True)
+            nombre = f"parte-{time.time_ns()}-{os.getpid()}-{next(self._secuencia)}.arrow"
+            temporal = os.path.join(particion, f".{nombre}.tmp")
+            escribir_ipc(temporal, tabla_resultados(filas))
+            # Los lectores solo ven archivos completos
+            os.replace(temporal, os.path.join(particion, nombre))
+            self.escritos += len(filas)
+
+    def flush(self, espera=30.0):
+        """Espera (como mucho `espera` segundos) a que la cola quede vacía."""
+        limite = time.monotonic() + espera
+        while self._cola.unfinished_tasks and time.monotonic() < limite:
+            time.sleep(0.01)
+
+    def cerrar(self):
+        """Deja de aceptar resultados, vuelca lo pendiente y detiene el hilo."""
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._cola.put(_FIN)
+        self._hilo.join()
+
+
+def tabla_resultados(filas):
+    """Tabla Arrow a partir de tuplas (token, campaña, modo, versión del banco, instante, puntuaciones)."""
+    import pyarrow as pa
+
+    tokens, campanas, modos, versiones, instantes, puntuaciones = zip(*filas)
+    puntuaciones = np.stack(puntuaciones)
+    brutas = puntuaciones["bruta"]
+    percentiles = (puntuaciones["percentil"] / 10).astype(np.float32)
+    promedio = percentiles.mean(axis=1, dtype=np.float64)
+    columnas = [
+        pa.array(tokens, pa.string()),
+        pa.array(campanas, pa.string()),
+        pa.array(modos, pa.string()),
+        pa.array(versiones, pa.string()),
+        pa.array(np.round(np.array(instantes) * 1000).astype(np.int64), pa.timestamp("ms", tz="UTC")),
+    ]
+    columnas += [pa.array(brutas[:, a]) for a in range(len(AREAS))]
+    columnas += [pa.array(percentiles[:, a]) for a in range(len(AREAS))]
+    columnas += [
+        pa.array(promedio.astype(np.float32)),
+        pa.DictionaryArray.from_arrays(
+            pa.array(calificar_global_lote(promedio)),
+            pa.array([titulo for titulo, _, _ in CALIFICACIONES_GLOBALES]),
+        ),
+    ]
+    return pa.Table.from_arrays(columnas, schema=_esquema())
+
+
+def escribir_ipc(ruta, tabla):
+    """Escribe una tabla como archivo Arrow IPC sin comprimir (legible por mapeo de memoria)."""
+    import pyarrow as pa
+
+    with pa.OSFile(ruta, "wb") as sink, pa.ipc.new_file(sink, tabla.schema) as escritor:
+        escritor.write_table(tabla)
+
+
+def archivos_resultados(directorio=None, desde=None, hasta=None):
+    """Rutas relativas (``dia=.../parte-*.arrow``) de los archivos exportados entre dos días (inclusive), en orden."""
+    directorio = directorio or os.environ.get("GABT_EXPORTACION", "gabt_exportacion")
+    for particion in sorted(os.listdir(directorio)) if os.path.isdir(directorio) else ():
+        dia = particion.partition("=")[2]
+        if not particion.startswith("dia=") or (desde and dia < desde) or (hasta and dia > hasta):
+            continue
+        for nombre in sorted(os.listdir(os.path.join(directorio, particion))):
+            if nombre.endswith(".arrow"):
+                yield f"{particion}/{nombre}"
+
+
+def leer_archivo(ruta):
+    """Un archivo exportado como tabla Arrow; sus buffers apuntan al mapeo, que vive mientras se usen."""
+    import pyarrow as pa
+
+    tabla = pa.ipc.open_file(pa.memory_map(ruta)).read_all()
+    esquema = _esquema()
+    # Archivos anteriores (brutas en uint8) se convierten al esquema actual para poder concatenarse
+    return tabla if tabla.schema.equals(esquema) else tabla.cast(esquema)
+
+
+def leer_resultados(directorio=None, desde=None, hasta=None):
+    """Resultados exportados entre dos días (inclusive) como tabla Arrow respaldada por mapeos de memoria."""
+    import pyarrow as pa
+
+    directorio = directorio or os.environ.get("GABT_EXPORTACION", "gabt_exportacion")
+    tablas = [leer_archivo(os.path.join(directorio, relativa))
+              for relativa in archivos_resultados(directorio, desde, hasta)]
+    if not tablas:
+        return _esquema().empty_table()
+    return pa.concat_tables(tablas)
+
+
+@lru_cache(maxsize=1)
+def obtener_exportador():
+    """Exportador compartido por todo el proceso (None si GABT_EXPORTACION='no')."""
+    directorio = os.environ.get("GABT_EXPORTACION", "gabt_exportacion")
+    if directorio.strip().lower() in ("no", "0", "off", ""):
+        return None
+    return ExportadorResultados(directorio)
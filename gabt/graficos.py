@@ -0,0 +1,109 @@
+"""Gráfico de radar del perfil por vector de percentiles redondeado.
+
+Dos salidas: la figura Plotly interactiva (plotly se importa al primer uso) y un SVG
+estático generado en el servidor, mucho más liviano para el navegador.
+
+Ambas salidas se memoizan por clave en un LRU acotado como cadenas inmutables, que se
+comparten entre sesiones sin riesgo: el SVG y la especificación JSON de la figura Plotly
+(``radar_spec``), nunca el objeto ``go.Figure``, que es mutable y cuya copia cuesta más
+que construirlo. Lo que sigue sin cachearse: ``st.plotly_chart`` valida la
+especificación (la convierte en una figura) y la vuelve a serializar en cada rerun. El
+modo SVG evita también ese costo.
+"""
+
+import json
+import math
+from functools import lru_cache
+from html import escape
+
+TITULO_RADAR = "Distribución Aptitudinal (Percentiles)"
+COLOR_RADAR = "#007ACC"  # Azul corporativo
+TICKS_RADAR = ((20, "Muy Bajo"), (40, "Bajo"), (60, "Promedio"), (80, "Alto"), (100, "Superior"))
+MAX_RADARES_EN_CACHE = 256
+
+
+def clave_radar(df):
+    """Clave de caché del radar: (áreas, percentiles redondeados a 1 decimal)."""
+    areas = tuple(df['Área'])
+    valores = tuple(round(float(p), 1) for p in df['Percentil'])
+    return areas, valores
+
+
+def radar_figura(areas, valores):
+    """Crea el gráfico de radar interactivo con Plotly (una figura nueva en cada llamada)."""
+    import plotly.graph_objects as go
+
+    fig = go.Figure(data=[
+        go.Scatterpolar(
+            r=list(valores),
+            theta=list(areas),
+            fill='toself',
+            name='Percentil del Usuario',
+            line_color=COLOR_RADAR
+        )],
+        layout=go.Layout(
+            title=go.layout.Title(text=TITULO_RADAR, x=0.5),
+            polar=dict(
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, 100],
+                    tickvals=[v for v, _ in TICKS_RADAR],
+                    ticktext=[t for _, t in TICKS_RADAR]
+                )
+            ),
+            showlegend=False,
+            height=600
+        )
+    )
+    return fig
+
+
+@lru_cache(maxsize=MAX_RADARES_EN_CACHE)
+def radar_spec(areas, valores):
+    """Especificación JSON de la figura Plotly (una vez por clave), lista para ``st.plotly_chart``."""
+    spec = radar_figura(areas, valores).to_plotly_json()
+    # Sin la plantilla por defecto: plotly la vuelve a aplicar al validar y el resultado es el mismo,
+    # pero validarla desde un dict cuesta varias veces más que la figura entera
+    spec["layout"].pop("template", None)
+    return json.dumps(spec)
+
+
+@lru_cache(maxsize=MAX_RADARES_EN_CACHE)
+def radar_svg(areas, valores, lado=600):
+    """Genera (una vez por clave) el radar como SVG estático, sin JavaScript ni dependencia de Plotly."""
+    # Lienzo más ancho que alto para que quepan las etiquetas laterales
+    ancho = lado * 4 // 3
+    cx, cy = ancho / 2, lado / 2 + 10
+    radio = lado * 0.3
+    n = len(areas)
+
+    def punto(i, valor):
+        # Primer eje arriba, sentido horario
+        angulo = math.pi / 2 - 2 * math.pi * i / n
+        r = radio * max(0.0, min(valor, 120.0)) / 100
+        return cx + r * math.cos(angulo), cy - r * math.sin(angulo)
+
+    def poligono(valores_eje):
+        return " ".join(f"{x:.1f},{y:.1f}" for x, y in (punto(i, v) for i, v in enumerate(valores_eje)))
+
+    partes = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {ancho} {lado}" width="100%" '
+        f'role="img" aria-label="{escape(TITULO_RADAR)}" font-family="sans-serif" font-size="12">',
+        f'<text x="{cx}" y="24" text-anchor="middle" font-size="17">{escape(TITULO_RADAR)}</text>',
+    ]
+    for valor, texto in TICKS_RADAR:
+        partes.append(f'<polygon points="{poligono([valor] * n)}" fill="none" stroke="#d0d0d0"/>')
+        _, y = punto(0, valor)
+        partes.append(f'<text x="{cx + 4}" y="{y - 3:.1f}" fill="#666" font-size="10">{escape(texto)}</text>')
+    for i, area in enumerate(areas):
+        x, y = punto(i, 100)
+        partes.append(f'<line x1="{cx}" y1="{cy}" x2="{x:.1f}" y2="{y:.1f}" stroke="#d0d0d0"/>')
+        lx, ly = punto(i, 112)
+        ancla = "middle" if abs(lx - cx) < 1 else ("start" if lx > cx else "end")
+        partes.append(f'<text x="{lx:.1f}" y="{ly + 4:.1f}" text-anchor="{ancla}">{escape(area)}</text>')
+    partes.append(
+        f'<polygon points="{poligono(valores)}" fill="{COLOR_RADAR}" fill-opacity="0.35" '
+        f'stroke="{COLOR_RADAR}" stroke-width="2"/>'
+    )
+    partes.append("</svg>")
+    return "".join(partes)
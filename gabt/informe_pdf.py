@@ -0,0 +1,340 @@
+"""Informe ejecutivo en PDF (fpdf) para un candidato o para una cohorte completa.
+
+Uso por lotes, a partir de la salida de ``python -m gabt.lote``:
+    python -m gabt.informe_pdf resultados.csv informes.zip --procesos 4
+
+El destino puede ser un .zip (se escribe a medida que llegan los informes) o un
+directorio. Los recursos estáticos (textos de sección y geometría del radar) se preparan una sola vez por proceso; el logo
+se inserta con la API pública de fpdf en cada informe. Si dos filas producen el mismo
+nombre de archivo (ids repetidos), las siguientes llevan el número de fila como sufijo.
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import zipfile
+from functools import lru_cache
+from itertools import islice
+
+from fpdf import FPDF
+
+from gabt.analisis import get_analisis_detalle, get_estrategias_de_mejora
+from gabt.aptitudes import APTITUDES_MAP, AREAS, N_PREGUNTAS_POR_AREA
+from gabt.puntuacion import calificar_global
+
+RUTA_LOGO = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logo empresa.JPG")
+TITULO_INFORME = "Informe Ejecutivo de Perfil Aptitudinal GABT Pro Max"
+SECCIONES = (
+    "1. Resumen Ejecutivo y Perfil Global",
+    "2. Indicadores Clave de Desempeño (KPIs)",
+    "3. Perfil Aptitudinal Visual",
+    "4. Análisis Comparativo del Perfil",
+    "5. Potencial de Rol y Plan de Desarrollo",
+)
+COLOR_INSTITUCIONAL = (0, 51, 102)  # #003366
+COLOR_RADAR = (0, 122, 204)  # #007ACC
+NOMBRE_ARCHIVO_INVALIDO = re.compile(r"[^\w.-]+")
+
+
+def _latin1(texto):
+    """Adapta un texto del informe a las fuentes base de PDF: sin markdown ni caracteres fuera de latin-1 (emojis)."""
+    texto = str(texto).replace("**", "")
+    return texto.encode("latin-1", "ignore").decode("latin-1").strip()
+
+
+def _items_html(html):
+    """Extrae los ítems <li> de los bloques HTML de get_analisis_detalle como texto plano."""
+    return [_latin1(item) for item in re.findall(r"<li>(.*?)</li>", html)]
+
+
+def _hex_a_rgb(color):
+    color = color.lstrip("#")
+    return tuple(int(color[i:i + 2], 16) for i in (0, 2, 4))
+
+
+@lru_cache(maxsize=1)
+def _textos_estaticos():
+    """Títulos y etiquetas fijas del informe, ya adaptados a latin-1."""
+    return {
+        "titulo": _latin1(TITULO_INFORME),
+        "secciones": tuple(_latin1(s) for s in SECCIONES),
+        "areas": {area: _latin1(area) for area in AREAS},
+        "estrategias": {area: _latin1(get_estrategias_de_mejora(area)) for area in AREAS},
+    }
+
+
+@lru_cache(maxsize=8)
+def _geometria_radar(n, cx, cy, radio):
+    """Precalcula anillos, ejes y posición de etiquetas del radar para n áreas."""
+    angulos = [math.pi / 2 - 2 * math.pi * i / n for i in range(n)]
+
+    def punto(i, fraccion):
+        return cx + radio * fraccion * math.cos(angulos[i]), cy - radio * fraccion * math.sin(angulos[i])
+
+    anillos = tuple(tuple(punto(i, nivel / 100) for i in range(n)) for nivel in (20, 40, 60, 80, 100))
+    ejes = tuple(punto(i, 1.0) for i in range(n))
+    etiquetas = tuple(punto(i, 1.12) for i in range(n))
+    return angulos, anillos, ejes, etiquetas
+
+
+def _poligono(pdf, puntos):
+    for (x1, y1), (x2, y2) in zip(puntos, puntos[1:] + puntos[:1]):
+        pdf.line(x1, y1, x2, y2)
+
+
+def _dibujar_radar(pdf, areas, valores, cx, cy, radio):
+    """Dibuja el radar con primitivas vectoriales de fpdf (sin imágenes rasterizadas)."""
+    textos = _textos_estaticos()["areas"]
+    angulos, anillos, ejes, etiquetas = _geometria_radar(len(areas), cx, cy, radio)
+    pdf.set_draw_color(200, 200, 200)
+    pdf.set_line_width(0.2)
+    for anillo in anillos:
+        _poligono(pdf, list(anillo))
+    for x, y in ejes:
+        pdf.line(cx, cy, x, y)
+    pdf.set_font("Arial", "", 7)
+    pdf.set_text_color(60, 60, 60)
+    for area, (x, y) in zip(areas, etiquetas):
+        texto = textos.get(area, _latin1(area))
+        ancho = pdf.get_string_width(texto)
+        if abs(x - cx) < 1:
+            x -= ancho / 2
+        elif x < cx:
+            x -= ancho
+        pdf.text(x, y + 1, texto)
+    puntos = [
+        (cx + radio * min(v, 100) / 100 * math.cos(a), cy - radio * min(v, 100) / 100 * math.sin(a))
+        for v, a in zip(valores, angulos)
+    ]
+    pdf.set_draw_color(*COLOR_RADAR)
+    pdf.set_line_width(0.8)
+    _poligono(pdf, puntos)
+
+
+def _titulo_seccion(pdf, indice):
+    pdf.ln(4)
+    pdf.set_font("Arial", "B", 12)
+    pdf.set_text_color(*COLOR_INSTITUCIONAL)
+    pdf.cell(0, 8, _textos_estaticos()["secciones"][indice], ln=1)
+    pdf.set_text_color(0, 0, 0)
+
+
+def informe_pdf(df_resultados, candidato=None):
+    """Genera el informe ejecutivo de un candidato (las mismas secciones que vista_resultados) como bytes PDF."""
+    textos = _textos_estaticos()
+    analisis = get_analisis_detalle(df_resultados)
+    areas = list(df_resultados['Área'])
+    percentiles = [float(p) for p in df_resultados['Percentil']]
+    avg_percentil = sum(percentiles) / len(percentiles)
+    calificacion, detalle_calificacion, color_calificacion = calificar_global(avg_percentil)
+
+    pdf = FPDF(format="A4")
+    pdf.set_auto_page_break(True, margin=15)
+    pdf.add_page()
+
+    # Cabecera con logo
+    if os.path.exists(RUTA_LOGO):
+        pdf.image(RUTA_LOGO, x=10, y=8, w=18)
+    pdf.set_xy(32, 10)
+    pdf.set_font("Arial", "B", 14)
+    pdf.set_text_color(*COLOR_INSTITUCIONAL)
+    pdf.cell(0, 8, textos["titulo"], ln=1)
+    if candidato is not None:
+        pdf.set_x(32)
+        pdf.set_font("Arial", "", 10)
+        pdf.set_text_color(90, 90, 90)
+        pdf.cell(0, 6, _latin1(f"Candidato: {candidato}"), ln=1)
+    pdf.set_y(30)
+
+    # 1. Resumen ejecutivo
+    _titulo_seccion(pdf, 0)
+    pdf.set_fill_color(*_hex_a_rgb(color_calificacion))
+    pdf.set_text_color(255, 255, 255)
+    pdf.set_font("Arial", "B", 14)
+    pdf.cell(0, 10, _latin1(calificacion), ln=1, align="C", fill=True)
+    pdf.set_font("Arial", "", 10)
+    pdf.cell(0, 7, _latin1(f"Percentil Promedio Global: {avg_percentil:.1f}%"), ln=1, align="C", fill=True)
+    pdf.multi_cell(0, 5, _latin1(f"Diagnóstico: {detalle_calificacion}"), align="C", fill=True)
+    pdf.set_text_color(0, 0, 0)
+    pdf.ln(2)
+    pdf.multi_cell(0, 5, _latin1(
+        f"Conclusiones del Evaluador: El perfil muestra una base {analisis['perfil']}, con una clara "
+        f"inclinación hacia {analisis['top_area']}. El individuo es particularmente apto para {analisis['potencial']}"
+    ))
+
+    # 2. KPIs y tabla de resultados
+    _titulo_seccion(pdf, 1)
+    i_max = max(range(len(percentiles)), key=percentiles.__getitem__)
+    n_superior = sum(p >= 80 for p in percentiles)
+    n_desarrollo = sum(p <= 40 for p in percentiles)
+    pdf.set_font("Arial", "", 10)
+    for texto in (
+        f"Máxima Aptitud: {percentiles[i_max]:.1f}% ({areas[i_max]})",
+        f"Áreas Fortalecidas (Percentil >= 80): {n_superior}",
+        f"Áreas de Desarrollo Prioritario (Percentil <= 40): {n_desarrollo}",
+    ):
+        pdf.cell(0, 6, _latin1(texto), ln=1)
+    pdf.ln(2)
+    anchos = (62, 16, 22, 22, 22, 46)
+    pdf.set_font("Arial", "B", 8)
+    pdf.set_fill_color(230, 240, 255)
+    for ancho, titulo in zip(anchos, ("Área", "Código", "Bruta", "%", "Percentil", "Clasificación")):
+        pdf.cell(ancho, 6, _latin1(titulo), border=1, fill=True)
+    pdf.ln()
+    pdf.set_font("Arial", "", 8)
+    for fila in zip(df_resultados['Área'], df_resultados['Código'], df_resultados['Puntuación Bruta'],
+                    df_resultados['Máxima Puntuación'], df_resultados['Porcentaje (%)'], df_resultados['Percentil'],
+                    df_resultados['Clasificación']):
+        area, code, bruta, maximo, porcentaje, percentil, clasificacion = fila
+        celdas = (textos["areas"].get(area, _latin1(area)), code, f"{int(bruta)}/{int(maximo)}",
+                  f"{porcentaje:.1f}", f"{percentil:.1f}", _latin1(clasificacion))
+        for ancho, celda in zip(anchos, celdas):
+            pdf.cell(ancho, 5, celda, border=1)
+        pdf.ln()
+
+    # 3. Radar (título y gráfico en la misma página)
+    if pdf.get_y() > 180:
+        pdf.add_page()
+    _titulo_seccion(pdf, 2)
+    cy = pdf.get_y() + 42
+    _dibujar_radar(pdf, areas, percentiles, 105, cy, 36)
+    pdf.set_text_color(0, 0, 0)
+    pdf.set_y(cy + 46)
+
+    # 4. Fortalezas y oportunidades
+    _titulo_seccion(pdf, 3)
+    for titulo, html, color in (
+        ("Fortalezas Intrínsecas (Top 3)", analisis["fortalezas"], (0, 128, 0)),
+        ("Áreas de Oportunidad (Bottom 3)", analisis["mejoras"], (220, 20, 60)),
+    ):
+        pdf.set_font("Arial", "B", 10)
+        pdf.set_text_color(*color)
+        pdf.cell(0, 6, _latin1(titulo), ln=1)
+        pdf.set_font("Arial", "", 9)
+        pdf.set_text_color(0, 0, 0)
+        for item in _items_html(html):
+            pdf.multi_cell(0, 5, "- " + item)
+
+    # 5. Potencial y estrategias
+    _titulo_seccion(pdf, 4)
+    pdf.set_font("Arial", "B", 10)
+    pdf.multi_cell(0, 5, _latin1(f"Potencial Ocupacional Recomendado: {analisis['potencial']}"))
+    pdf.ln(1)
+    bottom_areas = [area for area, p in zip(areas, percentiles) if p <= 40]
+    if bottom_areas:
+        for area in bottom_areas:
+            pdf.set_font("Arial", "B", 9)
+            pdf.cell(0, 5, _latin1(f"Estrategia para desarrollar {area} ({APTITUDES_MAP[area]['code']}) - Prioridad ALTA"), ln=1)
+            pdf.set_font("Arial", "", 9)
+            pdf.multi_cell(0, 5, textos["estrategias"][area])
+    else:
+        pdf.set_font("Arial", "", 9)
+        pdf.multi_cell(0, 5, _latin1("Su perfil es excepcional y equilibrado. El plan de acción es mantener las fortalezas y buscar la maestría profesional."))
+
+    return pdf.output(dest="S").encode("latin-1")
+
+
+# --- GENERACIÓN POR LOTES ---
+
+def _resultados_desde_fila(fila):
+    """Reconstruye el DataFrame de resultados de un candidato desde una fila de la salida de gabt.lote."""
+    import pandas as pd
+
+    codes = [APTITUDES_MAP[area]["code"] for area in AREAS]
+    return pd.DataFrame({
+        "Área": AREAS,
+        "Código": codes,
+        "Puntuación Bruta": [int(fila[f"{c}_bruta"]) for c in codes],
+        # Las salidas de gabt.lote anteriores a la columna <código>_maximo usan el banco estándar
+        "Máxima Puntuación": [int(fila.get(f"{c}_maximo") or N_PREGUNTAS_POR_AREA) for c in codes],
+        "Porcentaje (%)": [float(fila[f"{c}_porcentaje"]) for c in codes],
+        "Percentil": [float(fila[f"{c}_percentil"]) for c in codes],
+        "Clasificación": [fila[f"{c}_clasificacion"] for c in codes],
+    })
+
+
+def nombre_archivo(candidato):
+    """Nombre de archivo seguro para el informe de un candidato."""
+    return f"informe_{NOMBRE_ARCHIVO_INVALIDO.sub('_', str(candidato))}.pdf"
+
+
+def _procesar_informes(tarea):
+    """Tarea de un worker: genera los PDF de un bloque de filas y devuelve [(número de fila, nombre, bytes)]."""
+    filas, columna_id, inicio = tarea
+    return [
+        (inicio + i, nombre_archivo(fila[columna_id]), informe_pdf(_resultados_desde_fila(fila), fila[columna_id]))
+        for i, fila in enumerate(filas)
+    ]
+
+
+def _nombres_unicos(informes, usados):
+    """Renombra con el número de fila los informes cuyo nombre ya se escribió (ids repetidos)."""
+    for numero, nombre, contenido in informes:
+        while nombre in usados:
+            nombre = f"{nombre[:-len('.pdf')]}_{numero}.pdf"
+        usados.add(nombre)
+        yield nombre, contenido
+
+
+def leer_filas(ruta, tamano_bloque, columna_id="candidato"):
+    """Genera bloques de filas (dicts) de un archivo de resultados CSV/JSONL sin cargarlo completo."""
+    import csv
+    import json
+
+    with open(ruta, encoding="utf-8", newline="") as f:
+        if ruta.lower().endswith((".jsonl", ".ndjson")):
+            filas = (json.loads(linea) for linea in f if linea.strip())
+        else:
+            filas = csv.DictReader(f)
+        inicio = 1
+        while True:
+            bloque = list(islice(filas, tamano_bloque))
+            if not bloque:
+                break
+            yield bloque, columna_id, inicio
+            inicio += len(bloque)
+
+
+def generar_informes_lote(ruta_resultados, destino, procesos=1, tamano_bloque=100, columna_id="candidato"):
+    """Genera un PDF por candidato y los escribe en streaming en un .zip o en un directorio. Devuelve el total."""
+    from gabt.lote import procesar
+
+    tareas = leer_filas(ruta_resultados, tamano_bloque, columna_id)
+    usados = set()
+    total = 0
+    if destino.lower().endswith(".zip"):
+        # Los PDF ya vienen comprimidos: se almacenan sin recomprimir
+        with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_STORED) as archivo_zip:
+            for informes in procesar(tareas, procesos, funcion=_procesar_informes):
+                for nombre, contenido in _nombres_unicos(informes, usados):
+                    archivo_zip.writestr(nombre, contenido)
+                total += len(informes)
+    else:
+        os.makedirs(destino, exist_ok=True)
+        for informes in procesar(tareas, procesos, funcion=_procesar_informes):
+            for nombre, contenido in _nombres_unicos(informes, usados):
+                with open(os.path.join(destino, nombre), "wb") as f:
+                    f.write(contenido)
+            total += len(informes)
+    return total
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Genera informes PDF GABT a partir de resultados por lotes.")
+    parser.add_argument("resultados", help="Salida de gabt.lote (.csv o .jsonl)")
+    parser.add_argument("destino", help="Archivo .zip o directorio de salida")
+    parser.add_argument("--procesos", type=int, default=1, help="Número de procesos de generación")
+    parser.add_argument("--bloque", type=int, default=100, help="Informes por tarea enviada a cada proceso")
+    parser.add_argument("--columna-id", default="candidato", help="Columna/campo con el id del candidato")
+    args = parser.parse_args(argv)
+
+    total = generar_informes_lote(args.resultados, args.destino, args.procesos, args.bloque, args.columna_id)
+    print(f"{total} informes generados -> {args.destino}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,227 @@
+"""Puntuación por lotes sin interfaz: lee respuestas CSV/JSONL por bloques y escribe los resultados.
+
+Uso:
+    python -m gabt.lote respuestas.csv resultados.csv --procesos 4 --bloque 20000
+
+CSV: una fila por candidato, una columna de id (``--columna-id``) y una columna por
+pregunta (``q_<id>`` o ``<id>``) con la letra elegida ('a'..'d'; vacío = sin responder).
+JSONL: ``{"candidato": ..., "respuestas": {"<id>": "a", ...}}`` por línea (claves ``q_<id>`` o ``<id>``,
+como las columnas CSV); una línea mal formada detiene la ejecución indicando su número.
+Los percentiles se obtienen del baremo (``--normas``, por defecto el del paquete); con
+``--columna-grupo`` cada candidato usa el grupo normativo indicado en esa columna/campo.
+Con ``--agregados`` los resultados se suman además a los agregados de la campaña
+(``--campana``) para el panel de cohortes.
+La salida (CSV o JSONL según la extensión) conserva el orden de la entrada; los
+decimales se escriben redondeados a una cifra, como en el informe.
+"""
+
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import numpy as np
+import pandas as pd
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.banco import cargar_banco
+from gabt.cohortes import CAMPANA_POR_DEFECTO, Agregado, AlmacenAgregados
+from gabt.normas import cargar_normas
+from gabt.puntuacion import (
+    CALIFICACIONES_GLOBALES,
+    CLASIFICACIONES,
+    SIN_RESPUESTA,
+    codificar_clave,
+    codificar_letras,
+    codificar_respuestas,
+    puntuar,
+)
+
+COLUMNA_PREGUNTA = re.compile(r"^(?:q_)?(\d+)$")
+
+
+def _formato(ruta):
+    """Deduce el formato ('csv' o 'jsonl') por la extensión del archivo."""
+    return "jsonl" if ruta.lower().endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _matriz_desde_csv(bloque, clave, columna_id, columna_grupo=None):
+    """Codifica un bloque CSV (DataFrame de letras) como matriz int8 (n × n_ítems), con ids y grupos."""
+    matriz = np.full((len(bloque), len(clave.ids)), SIN_RESPUESTA, dtype=np.int8)
+    columnas, posiciones = [], []
+    for columna in bloque.columns:
+        coincidencia = COLUMNA_PREGUNTA.match(str(columna))
+        pos = clave.posicion.get(int(coincidencia.group(1))) if coincidencia else None
+        if pos is not None:
+            columnas.append(columna)
+            posiciones.append(pos)
+    if columnas:
+        matriz[:, posiciones] = codificar_letras(bloque[columnas].to_numpy(dtype=object))
+    if columna_id in bloque.columns:
+        ids = bloque[columna_id].to_numpy(dtype=object)
+    else:
+        ids = bloque.index.to_numpy()
+    grupos = bloque[columna_grupo].to_numpy(dtype=object) if columna_grupo in bloque.columns else None
+    return ids, matriz, grupos
+
+
+def _matriz_desde_jsonl(lineas, clave, columna_id, columna_grupo=None):
+    """Codifica un bloque de líneas JSONL como matriz int8 (n × n_ítems), con ids y grupos."""
+    matriz = np.full((len(lineas), len(clave.ids)), SIN_RESPUESTA, dtype=np.int8)
+    ids, grupos = [], []
+    for fila, (numero, linea) in enumerate(lineas):
+        try:
+            registro = json.loads(linea)
+            ids.append(registro.get(columna_id, numero))
+            grupos.append(registro.get(columna_grupo))
+            # Mismas claves que las columnas CSV: "<id>" o "q_<id>"; las demás se ignoran
+            respuestas = {}
+            for q_id, opcion in registro.get("respuestas", {}).items():
+                coincidencia = COLUMNA_PREGUNTA.match(str(q_id))
+                if coincidencia:
+                    respuestas[int(coincidencia.group(1))] = opcion
+            # Una opción que no es texto (lista, objeto) falla aquí con TypeError
+            matriz[fila] = codificar_respuestas(respuestas, clave)
+        except (ValueError, AttributeError, TypeError) as exc:
+            raise ValueError(f"Línea {numero + 1} de la entrada JSONL inválida: {exc}") from exc
+    return np.array(ids, dtype=object), matriz, (np.array(grupos, dtype=object) if columna_grupo else None)
+
+
+def tabla_resultados(ids, resultados, columna_id="candidato"):
+    """Aplana los resultados de un lote en una fila por candidato: bruta, máximo, %, percentil y clasificación por área."""
+    columnas = {columna_id: ids}
+    textos_clasificacion = np.array([texto for _, texto in CLASIFICACIONES], dtype=object)
+    for j, area in enumerate(AREAS):
+        code = APTITUDES_MAP[area]["code"]
+        columnas[f"{code}_bruta"] = resultados.brutas[:, j]
+        columnas[f"{code}_maximo"] = np.broadcast_to(resultados.maximos[..., j], len(ids))
+        columnas[f"{code}_porcentaje"] = np.round(resultados.porcentajes[:, j], 1)
+        columnas[f"{code}_percentil"] = np.round(resultados.percentiles[:, j], 1)
+        columnas[f"{code}_clasificacion"] = textos_clasificacion[resultados.clasificaciones[:, j]]
+    titulos_globales = np.array([titulo for titulo, _, _ in CALIFICACIONES_GLOBALES], dtype=object)
+    columnas["percentil_promedio"] = np.round(resultados.percentil_promedio, 1)
+    columnas["calificacion_global"] = titulos_globales[resultados.calificaciones]
+    return pd.DataFrame(columnas)
+
+
+def _serializar(tabla, formato):
+    """Serializa un bloque de resultados (sin cabecera) en el worker, para que el proceso principal solo escriba."""
+    if formato == "csv":
+        return tabla.to_csv(header=False, index=False)
+    return tabla.to_json(orient="records", lines=True, force_ascii=False)
+
+
+def decodificar_bloque(formato, cabecera, lineas, clave, columna_id="candidato", columna_grupo=None):
+    """Parsea un bloque de líneas crudas (ver bloques_crudos) y devuelve ids, matriz int8 de respuestas y grupos."""
+    if formato == "csv":
+        bloque = pd.read_csv(io.StringIO(cabecera + "".join(linea for _, linea in lineas)),
+                             dtype=object, keep_default_na=False)
+        bloque.index = [numero for numero, _ in lineas]
+        return _matriz_desde_csv(bloque, clave, columna_id, columna_grupo)
+    return _matriz_desde_jsonl(lineas, clave, columna_id, columna_grupo)
+
+
+def _procesar_bloque(tarea):
+    """Tarea de un worker: decodifica, puntúa, serializa y agrega un bloque. El banco se carga una vez por proceso."""
+    formato, cabecera, lineas, columna_id, formato_salida, ruta_normas, columna_grupo = tarea
+    clave = codificar_clave(cargar_banco())
+    normas = cargar_normas(ruta_normas)
+    ids, matriz, grupos = decodificar_bloque(formato, cabecera, lineas, clave, columna_id, columna_grupo)
+    indices_grupo = None if grupos is None else normas.indices_grupos(grupos)
+    resultados = puntuar(matriz, clave, normas, indices_grupo)
+    tabla = tabla_resultados(ids, resultados, columna_id)
+    return len(tabla), _serializar(tabla, formato_salida), Agregado.desde_resultados(resultados)
+
+
+def bloques_crudos(ruta, tamano_bloque):
+    """Genera (formato, cabecera, [(número, línea), ...]) de tamaño acotado, sin cargar el archivo completo.
+
+    El parseo se hace en los workers. En CSV se asume una fila por línea (sin saltos de línea entre comillas).
+    """
+    formato = _formato(ruta)
+    with open(ruta, encoding="utf-8", newline="") as f:
+        cabecera = f.readline() if formato == "csv" else ""
+        lineas = ((numero, linea) for numero, linea in enumerate(f) if linea.strip())
+        while True:
+            bloque = list(islice(lineas, tamano_bloque))
+            if not bloque:
+                break
+            yield formato, cabecera, bloque
+
+
+def leer_bloques(ruta, tamano_bloque, columna_id="candidato", formato_salida="csv", ruta_normas=None,
+                 columna_grupo=None):
+    """Genera las tareas de puntuación con las líneas crudas del archivo (ver bloques_crudos)."""
+    for formato, cabecera, bloque in bloques_crudos(ruta, tamano_bloque):
+        yield formato, cabecera, bloque, columna_id, formato_salida, ruta_normas, columna_grupo
+
+
+def procesar(tareas, procesos=1, funcion=_procesar_bloque):
+    """Aplica `funcion` a las tareas en orden; con varios procesos mantiene como máximo 2 tareas en vuelo por worker."""
+    if procesos <= 1:
+        for tarea in tareas:
+            yield funcion(tarea)
+        return
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        for tarea in tareas:
+            pendientes.append(pool.submit(funcion, tarea))
+            if len(pendientes) >= 2 * procesos:
+                yield pendientes.popleft().result()
+        while pendientes:
+            yield pendientes.popleft().result()
+
+
+def columnas_resultado(columna_id="candidato"):
+    """Nombres de columna de la salida, en el orden de tabla_resultados."""
+    columnas = [columna_id]
+    for area in AREAS:
+        code = APTITUDES_MAP[area]["code"]
+        columnas += [f"{code}_bruta", f"{code}_maximo", f"{code}_porcentaje", f"{code}_percentil",
+                     f"{code}_clasificacion"]
+    return columnas + ["percentil_promedio", "calificacion_global"]
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Puntúa por lotes respuestas de la batería GABT.")
+    parser.add_argument("entrada", help="Archivo de respuestas (.csv o .jsonl)")
+    parser.add_argument("salida", help="Archivo de resultados (.csv o .jsonl)")
+    parser.add_argument("--bloque", type=int, default=20000, help="Candidatos por bloque (memoria acotada)")
+    parser.add_argument("--procesos", type=int, default=1, help="Número de procesos de puntuación")
+    parser.add_argument("--columna-id", default="candidato", help="Columna/campo con el id del candidato")
+    parser.add_argument("--normas", default=None, help="Archivo de baremos (por defecto GABT_NORMAS o el del paquete)")
+    parser.add_argument("--columna-grupo", default=None, help="Columna/campo con el grupo normativo del candidato")
+    parser.add_argument("--agregados", default=None, help="Base SQLite de agregados de cohortes a actualizar")
+    parser.add_argument("--campana", default=CAMPANA_POR_DEFECTO, help="Campaña a la que se suman los resultados")
+    parser.add_argument("--dia", default=None, help="Día (AAAA-MM-DD) de los agregados; por defecto hoy (UTC)")
+    args = parser.parse_args(argv)
+
+    total = 0
+    agregado = Agregado()
+    formato_salida = _formato(args.salida)
+    tareas = leer_bloques(args.entrada, args.bloque, args.columna_id, formato_salida, args.normas, args.columna_grupo)
+    with open(args.salida, "w", encoding="utf-8", newline="") as salida:
+        if formato_salida == "csv":
+            # Mismo entrecomillado que los bloques serializados con pandas
+            csv.writer(salida, lineterminator="\n").writerow(columnas_resultado(args.columna_id))
+        for n, texto, parcial in procesar(tareas, args.procesos):
+            salida.write(texto)
+            agregado.combinar(parcial)
+            total += n
+    if args.agregados:
+        # Un solo registro al final: una ejecución interrumpida no deja la campaña a medias
+        almacen = AlmacenAgregados(args.agregados)
+        almacen.registrar(args.campana, agregado, args.dia)
+        almacen.cerrar()
+    print(f"{total} candidatos puntuados (baremo {cargar_normas(args.normas).version}) -> {args.salida}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
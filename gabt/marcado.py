@@ -0,0 +1,188 @@
+"""Marcado de preguntas y opciones precalculado: HTML con MathML para enunciados, texto plano para opciones.
+
+Los textos del banco usan un subconjunto de Markdown (``**negrita**``, ``*cursiva*``)
+y fórmulas ``$...$`` con un subconjunto de LaTeX (``\\frac``, ``\\text``, ``\\sqrt``,
+``^``, ``_`` y símbolos como ``\\pi`` o ``\\le``). Se convierten una vez, al indexar cada
+área del banco:
+
+- ``marcado_html``: fragmento HTML con las fórmulas en MathML, que la vista emite tal
+  cual (sin Markdown ni tipografía matemática en el navegador).
+- ``marcado_etiqueta``: etiqueta para ``st.radio`` con las fórmulas en texto Unicode
+  (``8π cm``, ``200 cm³``) y los ``$`` escapados, para que no se tipografíe nada.
+
+Un ``$`` seguido de un dígito no cierra una fórmula, así que los importes
+(``$1200 ... $1500``) se muestran como texto.
+"""
+
+import re
+from html import escape
+
+_FORMULA = re.compile(r"(?<!\\)\$(?=\S)(.+?)(?<!\\)\$(?!\d)")
+_NEGRITA = re.compile(r"\*\*(?=\S)(.+?)(?<=\S)\*\*")
+_CURSIVA = re.compile(r"(?<![*\w])\*(?=[^\s*])(.+?)(?<=[^\s*])\*(?![*\w])")
+_TOKEN = re.compile(r"\\[A-Za-z]+|\\.|\d+(?:\.\d+)?|[A-Za-z]|\s+|.")
+
+# Comando LaTeX -> (elemento MathML, carácter)
+SIMBOLOS = {
+    "pi": ("mi", "π"), "alpha": ("mi", "α"), "beta": ("mi", "β"), "theta": ("mi", "θ"), "infty": ("mi", "∞"),
+    "le": ("mo", "≤"), "leq": ("mo", "≤"), "ge": ("mo", "≥"), "geq": ("mo", "≥"), "neq": ("mo", "≠"),
+    "approx": ("mo", "≈"), "times": ("mo", "×"), "div": ("mo", "÷"), "cdot": ("mo", "·"), "pm": ("mo", "±"),
+    "rightarrow": ("mo", "→"), "to": ("mo", "→"), "leftarrow": ("mo", "←"), "Rightarrow": ("mo", "⇒"),
+    "%": ("mo", "%"), "$": ("mo", "$"), "{": ("mo", "{"), "}": ("mo", "}"),
+}
+ESPACIOS = {",", ";", ":", "!", " ", "quad", "qquad"}
+SUPERINDICES = str.maketrans("0123456789+-=()n", "⁰¹²³⁴⁵⁶⁷⁸⁹⁺⁻⁼⁽⁾ⁿ")
+SUBINDICES = str.maketrans("0123456789+-=()", "₀₁₂₃₄₅₆₇₈₉₊₋₌₍₎")
+
+
+# --- Análisis del subconjunto de LaTeX ---
+# Nodos: ('fila', [nodos]), ('mn'|'mi'|'mo'|'mtext', texto), ('espacio',),
+#        ('frac', num, den), ('raiz', nodo), ('sup'|'sub', base, indice)
+
+def _analizar(formula):
+    nodos, _ = _grupo(_TOKEN.findall(formula), 0)
+    return ("fila", nodos)
+
+
+def _grupo(tokens, i):
+    """Nodos hasta la llave de cierre (o el final); devuelve la posición tras ella."""
+    nodos = []
+    while i < len(tokens) and tokens[i] != "}":
+        token = tokens[i]
+        if token in ("^", "_") and nodos:
+            indice, i = _atomo(tokens, i + 1)
+            nodos[-1] = ("sup" if token == "^" else "sub", nodos[-1], indice)
+            continue
+        nodo, i = _atomo(tokens, i)
+        if nodo is not None:
+            nodos.append(nodo)
+    return nodos, i + 1
+
+
+def _argumento_texto(tokens, i):
+    """Contenido literal de un argumento ``{...}`` (p. ej. de \\text)."""
+    if i >= len(tokens) or tokens[i] != "{":
+        return "", i
+    profundidad, partes, i = 1, [], i + 1
+    while i < len(tokens):
+        profundidad += {"{": 1, "}": -1}.get(tokens[i], 0)
+        if profundidad == 0:
+            break
+        partes.append(tokens[i])
+        i += 1
+    return "".join(partes), i + 1
+
+
+def _atomo(tokens, i):
+    """Un átomo (número, letra, símbolo, comando o grupo) y la posición siguiente."""
+    if i >= len(tokens):
+        return ("fila", []), i
+    token = tokens[i]
+    if token == "{":
+        nodos, i = _grupo(tokens, i + 1)
+        return ("fila", nodos), i
+    if token.isspace():
+        return None, i + 1
+    if token.startswith("\\"):
+        comando = token[1:]
+        if comando == "frac":
+            numerador, i = _atomo(tokens, i + 1)
+            denominador, i = _atomo(tokens, i)
+            return ("frac", numerador, denominador), i
+        if comando == "sqrt":
+            radicando, i = _atomo(tokens, i + 1)
+            return ("raiz", radicando), i
+        if comando in ("text", "mathrm"):
+            texto, i = _argumento_texto(tokens, i + 1)
+            return ("mtext", texto), i
+        if comando in ESPACIOS:
+            return ("espacio",), i + 1
+        elemento, caracter = SIMBOLOS.get(comando, ("mtext", token))
+        return (elemento, caracter), i + 1
+    if token[0].isdigit():
+        return ("mn", token), i + 1
+    if token.isalpha():
+        return ("mi", token), i + 1
+    return ("mo", {"-": "−", "*": "·"}.get(token, token)), i + 1
+
+
+# --- Salidas: MathML y texto Unicode ---
+
+def _mathml(nodo):
+    tipo = nodo[0]
+    if tipo == "fila":
+        return "<mrow>" + "".join(_mathml(n) for n in nodo[1]) + "</mrow>"
+    if tipo == "frac":
+        return f"<mfrac>{_mathml(nodo[1])}{_mathml(nodo[2])}</mfrac>"
+    if tipo == "raiz":
+        return f"<msqrt>{_mathml(nodo[1])}</msqrt>"
+    if tipo in ("sup", "sub"):
+        return f"<m{tipo}>{_mathml(nodo[1])}{_mathml(nodo[2])}</m{tipo}>"
+    if tipo == "espacio":
+        return '<mspace width="0.2em"></mspace>'
+    texto = escape(nodo[1], quote=False)
+    if tipo == "mtext":
+        texto = texto.replace(" ", "\u00a0")
+    return f"<{tipo}>{texto}</{tipo}>"
+
+
+def _texto(nodo):
+    tipo = nodo[0]
+    if tipo == "fila":
+        return "".join(_texto(n) for n in nodo[1])
+    if tipo == "frac":
+        return f"{_parentesis(nodo[1])}/{_parentesis(nodo[2])}"
+    if tipo == "raiz":
+        return f"√{_parentesis(nodo[1])}"
+    if tipo in ("sup", "sub"):
+        indice = _texto(nodo[2])
+        tabla = SUPERINDICES if tipo == "sup" else SUBINDICES
+        convertido = indice.translate(tabla)
+        if any(c == o for c, o in zip(convertido, indice)):
+            convertido = f"{'^' if tipo == 'sup' else '_'}({indice})"
+        return _texto(nodo[1]) + convertido
+    if tipo == "espacio":
+        return " "
+    return nodo[1]
+
+
+def _parentesis(nodo):
+    texto = _texto(nodo)
+    return texto if re.fullmatch(r"[\w.]+", texto) else f"({texto})"
+
+
+def formula_mathml(formula):
+    """Fórmula LaTeX (sin los ``$``) como elemento ``<math>`` en línea."""
+    return f"<math>{_mathml(_analizar(formula))}</math>"
+
+
+def formula_texto(formula):
+    """Fórmula LaTeX (sin los ``$``) como texto Unicode de una línea."""
+    return _texto(_analizar(formula))
+
+
+def _enfasis_html(texto):
+    texto = _NEGRITA.sub(r"<strong>\1</strong>", escape(texto, quote=False))
+    return _CURSIVA.sub(r"<em>\1</em>", texto)
+
+
+def marcado_html(texto):
+    """Enunciado como fragmento HTML (párrafo) con énfasis y fórmulas MathML."""
+    partes, fin = [], 0
+    for formula in _FORMULA.finditer(texto):
+        partes.append(_enfasis_html(texto[fin:formula.start()]))
+        partes.append(formula_mathml(formula.group(1)))
+        fin = formula.end()
+    partes.append(_enfasis_html(texto[fin:]))
+    return "<p>" + "".join(partes).replace("\\$", "$") + "</p>"
+
+
+def marcado_etiqueta(texto):
+    """Opción como etiqueta Markdown para st.radio, con las fórmulas en texto y los ``$`` escapados."""
+    partes, fin = [], 0
+    for formula in _FORMULA.finditer(texto):
+        partes.append(texto[fin:formula.start()])
+        partes.append(formula_texto(formula.group(1)))
+        fin = formula.end()
+    partes.append(texto[fin:])
+    return re.sub(r"(?<!\\)\$", r"\\$", "".join(partes))
@@ -0,0 +1,212 @@
+"""Instrumentación de tramos (spans): histogramas de duración en el proceso y volcado periódico a JSONL.
+
+Se activa por entorno; desactivada, ``tramo`` devuelve un contexto vacío compartido y
+``medido`` devuelve la función sin envolver, así que el costo es nulo en la práctica:
+
+    GABT_METRICAS             archivo JSONL de volcado (vacío o sin definir: desactivado)
+    GABT_METRICAS_INTERVALO   segundos entre volcados (por defecto 60)
+    GABT_METRICAS_PUERTO      si se define, sirve el texto de las métricas en
+                              http://127.0.0.1:<puerto>/metrics (un puerto inválido u
+                              ocupado se registra en el log y no detiene el proceso)
+
+Cada tramo acumula un histograma de cubetas fijas (en milisegundos); cada volcado es
+una línea con los acumulados desde el arranque del proceso, n, suma y p50/p95/p99
+estimados por cubeta (``null`` si el percentil cae en la cubeta abierta, por encima de
+la última cota, para que cada línea sea JSON válido).
+"""
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import nullcontext
+from functools import wraps
+from itertools import accumulate
+
+RUTA = os.environ.get("GABT_METRICAS", "").strip()
+ACTIVAS = bool(RUTA)
+INTERVALO = float(os.environ.get("GABT_METRICAS_INTERVALO", "60"))
+# Límites superiores de las cubetas en ms; la última cubeta recoge todo lo que los supera
+CUBETAS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+_VACIO = nullcontext()
+_log = logging.getLogger(__name__)
+
+
+class Histograma:
+    """Conteos por cubeta, número y suma de duraciones de un tramo."""
+
+    __slots__ = ("conteos", "n", "suma_ms")
+
+    def __init__(self):
+        self.conteos = [0] * (len(CUBETAS_MS) + 1)
+        self.n = 0
+        self.suma_ms = 0.0
+
+    def agregar(self, ms):
+        self.conteos[bisect_left(CUBETAS_MS, ms)] += 1
+        self.n += 1
+        self.suma_ms += ms
+
+    def percentil(self, q):
+        """Límite superior de la cubeta que contiene el cuantil q (inf en la cubeta abierta)."""
+        if not self.n:
+            return None
+        i = bisect_left(list(accumulate(self.conteos)), q * self.n)
+        return CUBETAS_MS[i] if i < len(CUBETAS_MS) else float("inf")
+
+    def resumen(self):
+        percentiles = {f"p{round(q * 100)}_ms": self.percentil(q) for q in (0.5, 0.95, 0.99)}
+        return {
+            "n": self.n,
+            "suma_ms": round(self.suma_ms, 3),
+            # JSON no admite infinito: la cubeta abierta se informa como null
+            **{clave: None if valor == float("inf") else valor for clave, valor in percentiles.items()},
+            "cubetas": list(self.conteos),
+        }
+
+
+class Registro:
+    """Histogramas por nombre de tramo, compartidos por todos los hilos del proceso."""
+
+    def __init__(self):
+        self._histogramas = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, nombre, ms):
+        with self._lock:
+            histograma = self._histogramas.get(nombre)
+            if histograma is None:
+                histograma = self._histogramas[nombre] = Histograma()
+            histograma.agregar(ms)
+
+    def resumen(self):
+        with self._lock:
+            return {nombre: h.resumen() for nombre, h in sorted(self._histogramas.items())}
+
+    def texto(self):
+        """Métricas en formato de texto de Prometheus (histogramas acumulativos en segundos)."""
+        lineas = ["# TYPE gabt_tramo_segundos histogram"]
+        with self._lock:
+            for nombre, h in sorted(self._histogramas.items()):
+                acumulado = 0
+                for limite, conteo in zip((*CUBETAS_MS, float("inf")), h.conteos):
+                    acumulado += conteo
+                    le = "+Inf" if limite == float("inf") else repr(limite / 1000)
+                    lineas.append(f'gabt_tramo_segundos_bucket{{tramo="{nombre}",le="{le}"}} {acumulado}')
+                lineas.append(f'gabt_tramo_segundos_sum{{tramo="{nombre}"}} {h.suma_ms / 1000}')
+                lineas.append(f'gabt_tramo_segundos_count{{tramo="{nombre}"}} {h.n}')
+        return "\n".join(lineas) + "\n"
+
+    def volcar(self, ruta):
+        """Añade una línea JSON con los acumulados actuales al archivo indicado."""
+        linea = {"instante": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "pid": os.getpid(),
+                 "tramos": self.resumen()}
+        with open(ruta, "a", encoding="utf-8") as f:
+            f.write(json.dumps(linea, ensure_ascii=False, allow_nan=False) + "\n")
+
+
+registro = Registro()
+
+
+class _Tramo:
+    __slots__ = ("nombre", "inicio")
+
+    def __init__(self, nombre):
+        self.nombre = nombre
+
+    def __enter__(self):
+        self.inicio = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        registro.registrar(self.nombre, (time.perf_counter() - self.inicio) * 1000)
+        return False
+
+
+def tramo(nombre):
+    """Contexto que mide su bloque bajo `nombre` (sin efecto si las métricas están desactivadas)."""
+    return _Tramo(nombre) if ACTIVAS else _VACIO
+
+
+def medido(nombre):
+    """Decorador que mide cada llamada bajo `nombre`; desactivado, devuelve la función tal cual."""
+    def decorador(funcion):
+        if not ACTIVAS:
+            return funcion
+
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            with _Tramo(nombre):
+                return funcion(*args, **kwargs)
+        return envoltura
+    return decorador
+
+
+def _bucle_volcado():
+    while True:
+        time.sleep(INTERVALO)
+        try:
+            registro.volcar(RUTA)
+        except OSError:  # Un disco lleno o sin permisos no debe detener el volcado
+            _log.exception("No se pudieron volcar las métricas a %s", RUTA)
+
+
+def _volcar_al_salir():
+    try:
+        registro.volcar(RUTA)
+    except OSError:
+        _log.exception("No se pudieron volcar las métricas a %s al salir", RUTA)
+
+
+def _puerto():
+    """GABT_METRICAS_PUERTO como entero válido; None (con un error en el log) si no lo es."""
+    valor = os.environ.get("GABT_METRICAS_PUERTO", "").strip()
+    if not valor:
+        return None
+    try:
+        puerto = int(valor)
+    except ValueError:
+        puerto = 0
+    if not 1 <= puerto <= 65535:
+        _log.error("GABT_METRICAS_PUERTO inválido (%r): no se sirven las métricas por HTTP", valor)
+        return None
+    return puerto
+
+
+def _servidor(puerto):
+    """Servidor HTTP de /metrics enlazado a 127.0.0.1:puerto; None (con un error en el log) si no se puede."""
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            cuerpo = registro.texto().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def log_message(self, *args):
+            pass
+
+    try:
+        return ThreadingHTTPServer(("127.0.0.1", puerto), Manejador)
+    except OSError:
+        _log.exception("No se pudo abrir el puerto %d de métricas", puerto)
+        return None
+
+
+if ACTIVAS:
+    threading.Thread(target=_bucle_volcado, name="gabt-metricas", daemon=True).start()
+    atexit.register(_volcar_al_salir)
+    # El enlace se hace aquí (no en el hilo) para que un puerto ocupado quede en el log al arrancar
+    _puerto_http = _puerto()
+    _servidor_http = _servidor(_puerto_http) if _puerto_http else None
+    if _servidor_http is not None:
+        threading.Thread(target=_servidor_http.serve_forever, name="gabt-metricas-http", daemon=True).start()
@@ -0,0 +1,98 @@
+"""Baremos versionados: conversión vectorizada de puntuación bruta a percentil por área y grupo normativo.
+
+Formato del archivo (JSON)::
+
+    {"formato": 1, "version": "...", "grupos": {
+        "general": {"G": {"puntajes": [0, 1, ...], "percentiles": [0.0, 8.3, ...]}, ...},
+        "edad:18-25": {...}}}
+
+Cada tabla es escalonada: una puntuación bruta recibe el percentil del mayor puntaje de
+corte que no la supera. El grupo "general" es obligatorio y completa las áreas que
+falten en los demás grupos. Todas las tablas se aplanan en un único arreglo ordenado,
+de modo que millones de puntuaciones se convierten con una sola búsqueda binaria.
+"""
+
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+
+RUTA_NORMAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos", "normas.json")
+FORMATO_NORMAS = 1
+GRUPO_GENERAL = "general"
+# Separación entre tablas en el arreglo aplanado; las puntuaciones brutas deben ser menores
+_ESCALA = 1 << 20
+
+
+@dataclass(frozen=True, eq=False)
+class Normas:
+    """Tablas normativas aplanadas: claves ordenadas (grupo, área, puntaje) y su percentil."""
+    version: str
+    grupos: tuple
+    claves: np.ndarray
+    percentiles: np.ndarray
+
+    def indice_grupo(self, nombre):
+        """Índice de un grupo normativo; los grupos desconocidos usan el general."""
+        try:
+            return self.grupos.index(nombre)
+        except ValueError:
+            return 0
+
+    def indices_grupos(self, nombres):
+        """Versión vectorizada de indice_grupo para una columna de nombres de grupo."""
+        nombres = np.asarray(nombres, dtype=object)
+        indices = np.zeros(nombres.shape, dtype=np.int64)
+        for i, grupo in enumerate(self.grupos[1:], start=1):
+            indices[nombres == grupo] = i
+        return indices
+
+    def percentil(self, brutas, grupos=None):
+        """Convierte una matriz (n × n_áreas) de puntuaciones brutas en percentiles en una sola búsqueda."""
+        brutas = np.asarray(brutas, dtype=np.float64)
+        n_areas = len(AREAS)
+        base = np.arange(n_areas, dtype=np.float64)
+        if grupos is not None:
+            base = np.asarray(grupos, dtype=np.float64).reshape(-1, 1) * n_areas + base
+        claves = base * _ESCALA + np.clip(brutas, 0, _ESCALA - 1)
+        return self.percentiles[np.searchsorted(self.claves, claves, side="right") - 1]
+
+
+def construir_normas(datos):
+    """Valida y aplana un documento de baremos (dict con el formato del módulo)."""
+    if datos.get("formato") != FORMATO_NORMAS:
+        raise ValueError(f"Formato de baremo no soportado: {datos.get('formato')!r}")
+    tablas_por_grupo = datos["grupos"]
+    if GRUPO_GENERAL not in tablas_por_grupo:
+        raise ValueError("El baremo debe incluir el grupo 'general'")
+    grupos = (GRUPO_GENERAL,) + tuple(g for g in tablas_por_grupo if g != GRUPO_GENERAL)
+    claves, percentiles = [], []
+    for g, grupo in enumerate(grupos):
+        for a, area in enumerate(AREAS):
+            code = APTITUDES_MAP[area]["code"]
+            tabla = tablas_por_grupo[grupo].get(code) or tablas_por_grupo[GRUPO_GENERAL][code]
+            puntajes = np.asarray(tabla["puntajes"], dtype=np.float64)
+            valores = np.asarray(tabla["percentiles"], dtype=np.float64)
+            if len(puntajes) != len(valores) or len(puntajes) == 0:
+                raise ValueError(f"Tabla inválida para {grupo}/{code}")
+            if np.any(np.diff(puntajes) <= 0) or puntajes[0] > 0 or puntajes[-1] >= _ESCALA:
+                raise ValueError(f"Los puntajes de {grupo}/{code} deben ser crecientes y comenzar en 0")
+            claves.append((g * len(AREAS) + a) * _ESCALA + np.maximum(puntajes, 0))
+            percentiles.append(valores)
+    claves = np.concatenate(claves)
+    percentiles = np.concatenate(percentiles)
+    claves.flags.writeable = False
+    percentiles.flags.writeable = False
+    return Normas(version=datos["version"], grupos=grupos, claves=claves, percentiles=percentiles)
+
+
+@lru_cache(maxsize=4)
+def cargar_normas(ruta=None):
+    """Carga (una vez por proceso y ruta) el baremo indicado, el de GABT_NORMAS o el incluido en el paquete."""
+    ruta = ruta or os.environ.get("GABT_NORMAS") or RUTA_NORMAS
+    with open(ruta, encoding="utf-8") as f:
+        return construir_normas(json.load(f))
@@ -0,0 +1,179 @@
+"""Ajuste a perfiles ocupacionales: percentiles de los candidatos contra un catálogo de mínimos por área.
+
+Formato del catálogo (JSON, ``datos/ocupaciones.json`` o GABT_OCUPACIONES)::
+
+    {"formato": 1, "version": "...",
+     "familias": {"analitica": {"perfil": "..."}, ...},
+     "sin_ajuste": {"perfil": "...", "potencial": "..."},
+     "ocupaciones": [{"id": "...", "nombre": "...", "familia": "analitica",
+                      "minimos": {"G": 85, "N": 75}}, ...]}
+
+Para cada candidato y ocupación, sobre las áreas que la ocupación exige:
+
+- ``holgura``: el menor (percentil − mínimo); el candidato cumple el patrón si es ≥ 0.
+- ``afinidad``: el percentil promedio del candidato en esas áreas, que ordena a las
+  ocupaciones que cumple (prefiere las que usan sus fortalezas a las de cortes bajos).
+
+La afinidad es un producto matricial (candidatos × áreas por áreas × ocupaciones) y la
+holgura un mínimo sobre las 12 áreas, de modo que miles de ocupaciones y candidatos se
+evalúan en una pasada por bloque. Las ocupaciones que cumple van primero (por afinidad);
+si no cumple ninguna, el orden es por la menor distancia al corte.
+"""
+
+import argparse
+import json
+import os
+import sys
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+
+RUTA_CATALOGO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "datos", "ocupaciones.json")
+FORMATO_CATALOGO = 1
+CODIGOS = tuple(APTITUDES_MAP[area]["code"] for area in AREAS)
+# Celdas (candidatos × ocupaciones) por bloque: acota la memoria de los lotes grandes
+CELDAS_POR_BLOQUE = 1 << 22
+# Desplaza las ocupaciones que no cumple por debajo de cualquier afinidad posible (0..100)
+_PENALIZACION = 1000.0
+
+
+@dataclass(frozen=True, eq=False)
+class Catalogo:
+    """Patrones ocupacionales en arreglos: mínimos (ocupaciones × áreas) y máscara de áreas exigidas."""
+    version: str
+    ids: tuple
+    nombres: tuple
+    familias: np.ndarray       # índice de familia de cada ocupación
+    nombres_familias: tuple
+    perfiles_familias: tuple
+    sin_ajuste: dict
+    minimos: np.ndarray        # (n_ocupaciones × n_áreas) float32; -inf donde no se exige
+    exigidas: np.ndarray       # (n_áreas × n_ocupaciones) float32 0/1, para el producto de la afinidad
+    n_exigidas: np.ndarray     # (n_ocupaciones,)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def ajustar(self, percentiles, k=5):
+        """Las k mejores ocupaciones de cada candidato (matriz n × áreas, o un vector) en el orden de AREAS."""
+        percentiles = np.atleast_2d(np.asarray(percentiles, dtype=np.float32))
+        n, k = percentiles.shape[0], min(k, len(self))
+        indices = np.empty((n, k), dtype=np.int32)
+        afinidades = np.empty((n, k), dtype=np.float32)
+        holguras = np.empty((n, k), dtype=np.float32)
+        filas_bloque = max(1, CELDAS_POR_BLOQUE // max(len(self), 1))
+        for inicio in range(0, n, filas_bloque):
+            bloque = percentiles[inicio:inicio + filas_bloque]
+            afinidad = (bloque @ self.exigidas) / self.n_exigidas
+            holgura = np.full(afinidad.shape, np.inf, dtype=np.float32)
+            for a in range(len(AREAS)):
+                np.minimum(holgura, bloque[:, a, None] - self.minimos[:, a], out=holgura)
+            orden = np.where(holgura >= 0, afinidad, holgura - _PENALIZACION)
+            # Top-k sin ordenar todo el catálogo: partición y orden solo de los k elegidos
+            mejores = np.argpartition(-orden, k - 1, axis=1)[:, :k] if k < len(self) else \
+                np.broadcast_to(np.arange(len(self)), orden.shape)
+            filas = np.arange(len(bloque))[:, None]
+            mejores = np.take_along_axis(mejores, np.argsort(-orden[filas, mejores], axis=1, kind="stable"), axis=1)
+            fin = inicio + len(bloque)
+            indices[inicio:fin] = mejores
+            afinidades[inicio:fin] = afinidad[filas, mejores]
+            holguras[inicio:fin] = holgura[filas, mejores]
+        return Ajustes(catalogo=self, indices=indices, afinidades=afinidades, holguras=holguras)
+
+
+@dataclass(frozen=True, eq=False)
+class Ajustes:
+    """Top-k de ocupaciones por candidato (filas), de mejor a peor."""
+    catalogo: Catalogo
+    indices: np.ndarray
+    afinidades: np.ndarray
+    holguras: np.ndarray
+
+    @property
+    def cumple(self):
+        return self.holguras >= 0
+
+    def ocupaciones(self, fila=0):
+        """Lista de dicts (id, nombre, familia, afinidad, holgura, cumple) de un candidato."""
+        catalogo = self.catalogo
+        return [
+            {
+                "id": catalogo.ids[i],
+                "nombre": catalogo.nombres[i],
+                "familia": catalogo.nombres_familias[catalogo.familias[i]],
+                "afinidad": round(float(a), 1),
+                "holgura": round(float(h), 1),
+                "cumple": bool(h >= 0),
+            }
+            for i, a, h in zip(self.indices[fila], self.afinidades[fila], self.holguras[fila])
+        ]
+
+
+def construir_catalogo(datos):
+    """Catálogo a partir del dict JSON; valida los códigos de área de cada patrón."""
+    if datos.get("formato") != FORMATO_CATALOGO:
+        raise ValueError(f"Formato de catálogo no soportado: {datos.get('formato')!r}")
+    nombres_familias = tuple(datos["familias"])
+    ocupaciones = datos["ocupaciones"]
+    minimos = np.full((len(ocupaciones), len(AREAS)), -np.inf, dtype=np.float32)
+    for i, ocupacion in enumerate(ocupaciones):
+        desconocidos = set(ocupacion["minimos"]) - set(CODIGOS)
+        if desconocidos or not ocupacion["minimos"]:
+            raise ValueError(f"Ocupación {ocupacion['id']!r}: códigos de área inválidos {sorted(desconocidos)}")
+        for code, minimo in ocupacion["minimos"].items():
+            minimos[i, CODIGOS.index(code)] = minimo
+    exigidas = np.isfinite(minimos)
+    return Catalogo(
+        version=datos["version"],
+        ids=tuple(o["id"] for o in ocupaciones),
+        nombres=tuple(o["nombre"] for o in ocupaciones),
+        familias=np.array([nombres_familias.index(o["familia"]) for o in ocupaciones], dtype=np.int16),
+        nombres_familias=nombres_familias,
+        perfiles_familias=tuple(datos["familias"][f]["perfil"] for f in nombres_familias),
+        sin_ajuste=dict(datos["sin_ajuste"]),
+        minimos=minimos,
+        exigidas=np.ascontiguousarray(exigidas.T, dtype=np.float32),
+        n_exigidas=exigidas.sum(axis=1).astype(np.float32),
+    )
+
+
+@lru_cache(maxsize=4)
+def cargar_catalogo(ruta=None):
+    """Carga (una vez por ruta) el catálogo de ocupaciones."""
+    ruta = ruta or os.environ.get("GABT_OCUPACIONES") or RUTA_CATALOGO
+    with open(ruta, encoding="utf-8") as f:
+        return construir_catalogo(json.load(f))
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos: añade las k mejores ocupaciones a una salida de gabt.lote."""
+    import pandas as pd
+
+    parser = argparse.ArgumentParser(description="Ajuste de candidatos a perfiles ocupacionales.")
+    parser.add_argument("entrada", help="Resultados de gabt.lote (.csv) con columnas <código>_percentil")
+    parser.add_argument("salida", help="Archivo .csv de salida")
+    parser.add_argument("--catalogo", help="Catálogo JSON (por defecto el del paquete)")
+    parser.add_argument("-k", type=int, default=3, help="Ocupaciones por candidato")
+    parser.add_argument("--columna-id", default="candidato", help="Columna con el identificador del candidato")
+    args = parser.parse_args(argv)
+
+    catalogo = cargar_catalogo(args.catalogo)
+    tabla = pd.read_csv(args.entrada, usecols=[args.columna_id] + [f"{code}_percentil" for code in CODIGOS])
+    ajustes = catalogo.ajustar(tabla[[f"{code}_percentil" for code in CODIGOS]].to_numpy(), k=args.k)
+    columnas = {args.columna_id: tabla[args.columna_id]}
+    nombres = np.array(catalogo.nombres, dtype=object)
+    for j in range(ajustes.indices.shape[1]):
+        columnas[f"ocupacion_{j + 1}"] = nombres[ajustes.indices[:, j]]
+        columnas[f"afinidad_{j + 1}"] = np.round(ajustes.afinidades[:, j], 1)
+        columnas[f"cumple_{j + 1}"] = ajustes.cumple[:, j]
+    pd.DataFrame(columnas).to_csv(args.salida, index=False)
+    print(f"{len(tabla)} candidatos × {len(catalogo)} ocupaciones ({catalogo.version}) -> {args.salida}",
+          file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,189 @@
+"""Análisis de ítems del banco: dificultad, discriminación, distractores y alfa de Cronbach por área.
+
+Uso:
+    python -m gabt.psicometria respuestas.csv informe_items.csv --procesos 4
+
+La entrada es la misma que la de ``gabt.lote``. Cada bloque se reduce a estadísticos
+suficientes (conteos y sumas de la puntuación del área por ítem y opción), que se
+combinan sumándolos: la memoria no depende del número de filas. Con ellos se calculan,
+por ítem:
+
+- ``dificultad``: proporción de aciertos (p).
+- ``discriminacion``: correlación punto-biserial corregida (ítem vs. resto del área).
+- ``frec_a`` .. ``frec_d`` y ``frec_omitida``: frecuencia de cada opción.
+- ``resto_a`` .. ``resto_d``: puntuación media en el resto del área de quienes eligen
+  cada opción. Si un distractor supera a la clave, el ítem probablemente está mal
+  codificado y ``clave_sugerida`` propone la opción con mejor resto.
+- ``alfa_area`` y ``alfa_sin_item``: alfa de Cronbach del área con y sin el ítem.
+"""
+
+import argparse
+import sys
+from dataclasses import dataclass
+
+import numpy as np
+
+from gabt.aptitudes import APTITUDES_MAP, AREAS
+from gabt.banco import cargar_banco
+from gabt.lote import bloques_crudos, decodificar_bloque, procesar
+from gabt.puntuacion import OPCIONES, SIN_RESPUESTA, codificar_clave
+
+# Columnas de opción: 'a'..'d' y la última para las omitidas
+N_COLUMNAS_OPCION = len(OPCIONES) + 1
+# Umbrales de las alertas del informe
+DIFICULTAD_MINIMA = 0.20
+DIFICULTAD_MAXIMA = 0.90
+DISCRIMINACION_MINIMA = 0.20
+DISCRIMINACION_CLAVE_ERRONEA = -0.05  # Por debajo, con un distractor mejor que la clave, se sugiere otra clave
+FRECUENCIA_MINIMA_DISTRACTOR = 0.05
+
+
+@dataclass(eq=False)
+class EstadisticosItems:
+    """Estadísticos suficientes del análisis de ítems; dos bloques se combinan sumándolos."""
+    n: int
+    conteos: np.ndarray       # (n_ítems × opciones+omitida) candidatos que eligen cada opción
+    sumas_area: np.ndarray    # (n_ítems × opciones+omitida) suma de la puntuación del área de esos candidatos
+    suma_total: np.ndarray    # (n_áreas,) suma de puntuaciones por área
+    suma_total2: np.ndarray   # (n_áreas,) suma de cuadrados de puntuaciones por área
+
+    @classmethod
+    def desde_respuestas(cls, respuestas, clave):
+        """Reduce una matriz (n × n_ítems) de respuestas codificadas a sus estadísticos."""
+        respuestas = np.atleast_2d(np.asarray(respuestas, dtype=np.int8))
+        n_items = len(clave.ids)
+        totales = (respuestas == clave.correctas).astype(np.int32) @ clave.matriz_areas
+        # Índice plano (ítem, opción) con las omitidas en la última columna
+        opcion = np.where(respuestas == SIN_RESPUESTA, N_COLUMNAS_OPCION - 1, respuestas).astype(np.int64)
+        plano = (np.arange(n_items) * N_COLUMNAS_OPCION + opcion).ravel()
+        tamano = n_items * N_COLUMNAS_OPCION
+        return cls(
+            n=respuestas.shape[0],
+            conteos=np.bincount(plano, minlength=tamano).reshape(n_items, N_COLUMNAS_OPCION),
+            sumas_area=np.bincount(plano, weights=totales[:, clave.area_por_item].ravel(), minlength=tamano)
+            .reshape(n_items, N_COLUMNAS_OPCION),
+            suma_total=totales.sum(axis=0, dtype=np.int64),
+            suma_total2=(totales.astype(np.int64) ** 2).sum(axis=0),
+        )
+
+    def combinar(self, otro):
+        """Suma los estadísticos de otro bloque a estos."""
+        self.n += otro.n
+        self.conteos += otro.conteos
+        self.sumas_area += otro.sumas_area
+        self.suma_total += otro.suma_total
+        self.suma_total2 += otro.suma_total2
+        return self
+
+
+def informe_items(estadisticos, banco=None):
+    """Informe por ítem (DataFrame) a partir de los estadísticos acumulados."""
+    import pandas as pd
+
+    banco = banco or cargar_banco()
+    clave = codificar_clave(banco)
+    n = max(estadisticos.n, 1)
+    filas = np.arange(len(clave.ids))
+    areas = clave.area_por_item
+    correctas = clave.correctas.astype(np.int64)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frecuencias = estadisticos.conteos / n
+        p = frecuencias[filas, correctas]
+        var_item = p * (1 - p)
+        media_total = estadisticos.suma_total / n
+        var_total = estadisticos.suma_total2 / n - media_total ** 2
+        # cov(acierto, total del área): solo quienes aciertan aportan al producto
+        cov = estadisticos.sumas_area[filas, correctas] / n - p * media_total[areas]
+        var_resto = var_total[areas] - 2 * cov + var_item
+        discriminacion = (cov - var_item) / np.sqrt(var_item * var_resto)
+
+        # Alfa de Cronbach por área y sin cada ítem: k/(k-1) · (1 - Σ var_ítem / var_total)
+        k = clave.n_por_area.astype(np.float64)
+        suma_var = np.bincount(areas, weights=var_item, minlength=len(AREAS))
+        alfa = k / (k - 1) * (1 - suma_var / var_total)
+        k_sin = k[areas] - 1
+        alfa_sin = k_sin / (k_sin - 1) * (1 - (suma_var[areas] - var_item) / var_resto)
+
+        # Resto medio por opción: la propia respuesta suma 1 al total solo si es la clave
+        es_clave = np.zeros(estadisticos.conteos.shape)
+        es_clave[filas, correctas] = 1
+        resto = estadisticos.sumas_area / estadisticos.conteos - es_clave
+
+    opciones = resto[:, :len(OPCIONES)]
+    elegibles = np.where(frecuencias[:, :len(OPCIONES)] >= FRECUENCIA_MINIMA_DISTRACTOR, opciones, -np.inf)
+    mejor = np.argmax(elegibles, axis=1)
+    sospechosa = ((mejor != correctas) & np.isfinite(elegibles[filas, mejor])
+                  & (discriminacion < DISCRIMINACION_CLAVE_ERRONEA))
+
+    alertas = []
+    for i in filas:
+        motivos = []
+        if sospechosa[i]:
+            motivos.append(f"posible clave errónea ('{OPCIONES[mejor[i]]}')")
+        if p[i] < DIFICULTAD_MINIMA:
+            motivos.append("muy difícil")
+        elif p[i] > DIFICULTAD_MAXIMA:
+            motivos.append("muy fácil")
+        if not sospechosa[i] and not discriminacion[i] >= DISCRIMINACION_MINIMA:
+            motivos.append("baja discriminación")
+        alertas.append("; ".join(motivos))
+
+    columnas = {
+        "id": clave.ids,
+        "area": [APTITUDES_MAP[AREAS[a]]["code"] for a in areas],
+        "clave": [OPCIONES[c] for c in correctas],
+        "n": estadisticos.n - estadisticos.conteos[:, -1],
+        "dificultad": p,
+        "discriminacion": discriminacion,
+    }
+    for j, opcion in enumerate(OPCIONES):
+        columnas[f"frec_{opcion}"] = frecuencias[:, j]
+    columnas["frec_omitida"] = frecuencias[:, -1]
+    for j, opcion in enumerate(OPCIONES):
+        columnas[f"resto_{opcion}"] = opciones[:, j]
+    columnas["alfa_area"] = alfa[areas]
+    columnas["alfa_sin_item"] = alfa_sin
+    columnas["clave_sugerida"] = np.where(sospechosa, np.array(OPCIONES)[mejor], "")
+    columnas["alertas"] = alertas
+    tabla = pd.DataFrame(columnas)
+    decimales = tabla.select_dtypes("float").columns
+    tabla[decimales] = tabla[decimales].round(3)
+    return tabla
+
+
+def _estadisticos_bloque(tarea):
+    """Tarea de un worker: decodifica un bloque de respuestas y lo reduce a estadísticos."""
+    formato, cabecera, lineas = tarea
+    clave = codificar_clave(cargar_banco())
+    _, matriz, _ = decodificar_bloque(formato, cabecera, lineas, clave)
+    return EstadisticosItems.desde_respuestas(matriz, clave)
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Análisis de ítems del banco GABT a partir de respuestas.")
+    parser.add_argument("entrada", help="Archivo de respuestas (.csv o .jsonl), como en gabt.lote")
+    parser.add_argument("salida", help="Informe por ítem (.csv)")
+    parser.add_argument("--bloque", type=int, default=50000, help="Candidatos por bloque (memoria acotada)")
+    parser.add_argument("--procesos", type=int, default=1, help="Número de procesos")
+    args = parser.parse_args(argv)
+
+    estadisticos = None
+    for parcial in procesar(bloques_crudos(args.entrada, args.bloque), args.procesos, funcion=_estadisticos_bloque):
+        estadisticos = parcial if estadisticos is None else estadisticos.combinar(parcial)
+    if estadisticos is None:
+        print("Sin respuestas en la entrada", file=sys.stderr)
+        return 1
+    tabla = informe_items(estadisticos)
+    tabla.to_csv(args.salida, index=False)
+
+    print(f"{estadisticos.n} candidatos analizados -> {args.salida}", file=sys.stderr)
+    for code, alfa in tabla.groupby("area", sort=False)["alfa_area"].first().items():
+        print(f"  alfa {code}: {alfa:.3f}", file=sys.stderr)
+    print(f"  ítems con alertas: {(tabla['alertas'] != '').sum()} de {len(tabla)}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
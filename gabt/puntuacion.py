@@ -0,0 +1,185 @@
+"""Motor de puntuación vectorizado: una sesión o una matriz (n_candidatos × n_ítems).
+
+pandas solo se importa al construir DataFrames, para que el núcleo cargue rápido en workers.
+"""
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+from gabt.aptitudes import AREAS
+from gabt.normas import cargar_normas
+
+# Codificación de respuestas: 'a'..'d' -> 0..3, sin responder -> -1
+OPCIONES = ("a", "b", "c", "d")
+CODIGO_OPCION = {k: i for i, k in enumerate(OPCIONES)}
+SIN_RESPUESTA = -1
+
+# Baremo de clasificación: límite inferior (inclusivo) de cada rango, de menor a mayor
+UMBRALES_PERCENTIL = (10, 20, 40, 60, 80, 90)
+CLASIFICACIONES = (
+    (5, "Muy Bajo (0-9)"),
+    (15, "Bajo (10-19)"),
+    (30, "Promedio Bajo (20-39)"),
+    (50, "Promedio (40-59)"),
+    (70, "Promedio Alto (60-79)"),
+    (88, "Alto (80-89)"),
+    (96, "Superior (90-99)"),
+)
+
+UMBRALES_GLOBALES = (40, 65, 85)
+CALIFICACIONES_GLOBALES = (
+    ("Período de Desarrollo 🛠️", "El perfil requiere un período de enfoque intensivo en el desarrollo de aptitudes clave. Se recomienda comenzar con roles de soporte y entrenamiento continuo.", "#dc143c"),
+    ("Perfil Competitivo 💼", "El perfil se sitúa en el promedio superior, demostrando suficiencia en todas las áreas. Apto para la mayoría de roles operativos y de coordinación.", "#ff8c00"),
+    ("Nivel Profesional Avanzado 🏆", "El perfil es sólido, con fortalezas claras y un buen balance aptitudinal. Excelente para roles técnicos especializados, de gestión de proyectos y consultoría.", "#4682b4"),
+    ("Potencial Ejecutivo 🌟", "El perfil indica un potencial excepcionalmente alto y equilibrado para roles directivos, estratégicos y de alta complejidad.", "#008000"),
+)
+
+
+# Clasificación y Calificación Global
+def clasificar_percentil(porcentaje):
+    """Clasifica el percentil en rangos."""
+    return CLASIFICACIONES[bisect_right(UMBRALES_PERCENTIL, porcentaje)]
+
+def calificar_global(avg_percentil):
+    """Genera la calificación ejecutiva."""
+    return CALIFICACIONES_GLOBALES[bisect_right(UMBRALES_GLOBALES, avg_percentil)]
+
+def clasificar_percentiles(percentiles):
+    """Versión vectorizada de clasificar_percentil: devuelve el índice en CLASIFICACIONES."""
+    return np.searchsorted(UMBRALES_PERCENTIL, percentiles, side="right").astype(np.int8)
+
+def calificar_global_lote(avg_percentiles):
+    """Versión vectorizada de calificar_global: devuelve el índice en CALIFICACIONES_GLOBALES."""
+    return np.searchsorted(UMBRALES_GLOBALES, avg_percentiles, side="right").astype(np.int8)
+
+
+@dataclass(frozen=True, eq=False)
+class ClaveCodificada:
+    """Clave de respuestas del banco como arreglos enteros pequeños."""
+    version: str
+    ids: tuple
+    posicion: dict
+    correctas: np.ndarray
+    area_por_item: np.ndarray
+    matriz_areas: np.ndarray
+    n_por_area: np.ndarray
+
+
+@lru_cache(maxsize=4)
+def codificar_clave(banco):
+    """Codifica la clave del banco una vez por versión del banco."""
+    # Solo usa la clave del índice del banco: no decodifica los textos de las preguntas
+    ids = banco.ids
+    correctas = np.array([CODIGO_OPCION[c] for c in banco.correctas], dtype=np.int8)
+    area_por_item = np.array([AREAS.index(area) for area in banco.areas], dtype=np.intp)
+    # Matriz one-hot (n_ítems × n_áreas) para sumar aciertos por área con un solo producto
+    matriz_areas = np.zeros((len(ids), len(AREAS)), dtype=np.int32)
+    matriz_areas[np.arange(len(ids)), area_por_item] = 1
+    for arr in (correctas, area_por_item, matriz_areas):
+        arr.flags.writeable = False
+    return ClaveCodificada(
+        version=banco.version,
+        ids=ids,
+        posicion={q_id: i for i, q_id in enumerate(ids)},
+        correctas=correctas,
+        area_por_item=area_por_item,
+        matriz_areas=matriz_areas,
+        n_por_area=matriz_areas.sum(axis=0),
+    )
+
+
+def codificar_respuestas(respuestas, clave):
+    """Convierte el dict {id_pregunta: 'a'..'d'} de una sesión (o RespuestasCompactas) en un vector int8."""
+    # Las posiciones de RespuestasCompactas solo valen para el banco con el que se construyeron;
+    # con otro banco se recodifican por id como un dict
+    if hasattr(respuestas, "codigos") and respuestas.version == clave.version:
+        return respuestas.codigos()
+    fila = np.full(len(clave.ids), SIN_RESPUESTA, dtype=np.int8)
+    for q_id, opcion in respuestas.items():
+        pos = clave.posicion.get(q_id)
+        if pos is not None and opcion in CODIGO_OPCION:
+            fila[pos] = CODIGO_OPCION[opcion]
+    return fila
+
+
+def codificar_letras(valores):
+    """Convierte un arreglo de letras ('a'..'d', vacío o nulo) en códigos int8 de forma vectorizada."""
+    valores = np.asarray(valores)
+    if valores.dtype == object:
+        import pandas as pd
+
+        valores = np.where(pd.isna(valores), "", valores)
+    # Cada celda como 2 puntos de código UCS-4: válida si es una sola letra entre 'a' y 'd'
+    puntos = np.asarray(valores, dtype="U2").view(np.uint32).reshape(valores.shape + (2,))
+    primera = puntos[..., 0].astype(np.int64) - ord(OPCIONES[0])
+    validas = (puntos[..., 1] == 0) & (primera >= 0) & (primera < len(OPCIONES))
+    return np.where(validas, primera, SIN_RESPUESTA).astype(np.int8)
+
+
+@dataclass(frozen=True)
+class ResultadosLote:
+    """Puntuaciones por área para n candidatos (filas) en el orden de AREAS (columnas)."""
+    brutas: np.ndarray
+    porcentajes: np.ndarray
+    percentiles: np.ndarray
+    clasificaciones: np.ndarray
+    maximos: np.ndarray
+    version_normas: str = None
+
+    def __len__(self):
+        return self.brutas.shape[0]
+
+    @property
+    def percentil_promedio(self):
+        """Percentil promedio global de cada candidato."""
+        return self.percentiles.mean(axis=1)
+
+    @property
+    def calificaciones(self):
+        """Índice de calificación global (ver CALIFICACIONES_GLOBALES) de cada candidato."""
+        return calificar_global_lote(self.percentil_promedio)
+
+
+def puntuar(respuestas, clave, normas=None, grupos=None):
+    """Puntúa en una sola pasada una matriz (n × n_ítems) de respuestas codificadas (o un vector).
+
+    Los percentiles salen del baremo (`normas`, por defecto cargar_normas()); `grupos` es un
+    índice de grupo normativo por candidato (None = grupo general).
+    """
+    respuestas = np.atleast_2d(np.asarray(respuestas, dtype=np.int8))
+    aciertos = (respuestas == clave.correctas).astype(np.int32)
+    return resultados_desde_brutas(aciertos @ clave.matriz_areas, clave, normas, grupos)
+
+
+def resultados_desde_brutas(brutas, clave, normas=None, grupos=None):
+    """Completa porcentajes, percentiles y clasificaciones a partir de una matriz (n × n_áreas) de brutas."""
+    brutas = np.atleast_2d(brutas)
+    porcentajes = brutas / clave.n_por_area * 100
+    normas = normas or cargar_normas()
+    percentiles = normas.percentil(brutas, grupos)
+    return ResultadosLote(
+        brutas=brutas,
+        porcentajes=porcentajes,
+        percentiles=percentiles,
+        clasificaciones=clasificar_percentiles(percentiles),
+        maximos=clave.n_por_area,
+        version_normas=normas.version,
+    )
+
+
+def puntuar_sesion(respuestas, banco, normas=None, grupo=None):
+    """Puntúa las respuestas de una sesión (dict id -> letra) con el mismo motor que el lote."""
+    clave = codificar_clave(banco)
+    normas = normas or cargar_normas()
+    grupos = None if grupo is None else [normas.indice_grupo(grupo)]
+    return puntuar(codificar_respuestas(respuestas, clave), clave, normas, grupos)
+
+
+def resultados_dataframe(resultados, fila=0):
+    """Construye el DataFrame de resultados de un candidato, con las columnas del informe."""
+    from gabt.estado import ResultadosCompactos
+
+    return ResultadosCompactos.desde_resultados(resultados, fila).dataframe()
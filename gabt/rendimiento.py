@@ -0,0 +1,273 @@
+"""Microbenchmarks del núcleo con líneas base por máquina en JSON y umbral de regresión.
+
+Uso:
+    python -m gabt.rendimiento                       # mide y compara con la base de esta máquina
+    python -m gabt.rendimiento --guardar             # mide y reemplaza la base de esta máquina
+    python -m gabt.rendimiento --filtro puntuar --tolerancia 0.3
+
+Cada caso se mide con un número de iteraciones calibrado (≈ ``--objetivo`` segundos por
+repetición) y ``--repeticiones`` repeticiones; se informa la mediana y el mínimo por
+llamada.
+
+La base (``rendimiento_base.json`` en la raíz del repositorio) guarda una medición por
+máquina, identificada por una huella del procesador, número de CPU y versiones de
+Python y numpy; en una máquina sin base se informa la medición y se sale con 0. Cada
+caso se compara por su razón (actual / base) con la base de esta máquina. Con
+``--relativa`` la razón se divide además por la mediana de las razones de todos los casos
+cuando esta es mayor que 1 (y hay al menos ``MIN_CASOS_RELATIVOS``), para tolerar una
+máquina cargada; la escala usada se informa, porque en ese modo una regresión que
+afecte a la mayoría de los casos se compensa a sí misma. Un caso cuya razón supera
+1 + tolerancia (por defecto 25 %) se vuelve a medir hasta ``--confirmaciones`` veces y se conserva su medición más rápida;
+solo si sigue por encima es regresión, y en ese caso el código de salida es 1. Al guardar,
+cada caso se mide 1 + ``--confirmaciones`` veces y la base conserva la medición central,
+para no fijar como referencia una tanda excepcionalmente rápida.
+
+Los casos llaman a las mismas funciones del núcleo que usa ``mn.py`` (que no puede
+importarse fuera de Streamlit): construcción del banco en frío (índice y DataFrame),
+área completa, cálculo de resultados (real, adaptativo y simulado) de gabt.sesion,
+análisis detallado, gráfico de radar (construcción, especificación cacheada y su costo por
+rerun en ``st.plotly_chart``) y percentiles aleatorios, además de la puntuación por lotes
+con 1, 1.000 y 100.000 candidatos y el ajuste a perfiles ocupacionales con 1 y 1.000
+candidatos.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+
+RUTA_BASE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "rendimiento_base.json")
+FORMATO_BASE = 2
+# Casos comparados necesarios para normalizar por la mediana de las razones
+MIN_CASOS_RELATIVOS = 5
+
+
+def _casos():
+    """Lista de (nombre, función sin argumentos) a medir; la preparación queda fuera de la medición."""
+    from gabt.analisis import generate_random_percentiles, get_analisis_detalle, resultados_compactos_desde_percentiles
+    from gabt.aptitudes import AREAS
+    from gabt.banco import cargar_banco, generate_gatb_questions, invalidar_banco
+    from gabt.estado import RespuestasCompactas
+    from gabt.graficos import clave_radar, radar_figura, radar_spec, radar_svg
+    from gabt.normas import cargar_normas
+    from gabt.ocupaciones import cargar_catalogo
+    from gabt.puntuacion import OPCIONES, codificar_clave, puntuar
+    from gabt.sesion import area_completa, calcular_resultados
+    from gabt.tiempos import TiemposSesion
+
+    banco = cargar_banco()
+    clave = codificar_clave(banco)
+    cargar_normas()
+    rng = np.random.default_rng(0)
+    respuestas = RespuestasCompactas(clave, {q_id: OPCIONES[rng.integers(4)] for q_id in clave.ids})
+    tiempos = TiemposSesion(clave)
+    tiempos.primera_vista[:] = np.arange(len(clave.ids)) * 20.0
+    tiempos.primera_respuesta[:] = tiempos.primera_vista + rng.uniform(2, 15, len(clave.ids))
+    area = AREAS[len(AREAS) // 2]
+    df = resultados_compactos_desde_percentiles(generate_random_percentiles()).dataframe()
+    areas, valores = clave_radar(df)
+
+    def radar_rerun():
+        # Lo que hace st.plotly_chart en cada rerun con la especificación cacheada
+        import plotly.io
+        import plotly.tools
+
+        figura = plotly.tools.return_figure_from_figure_or_data(json.loads(radar_spec(areas, valores)), True)
+        plotly.io.to_json(figura, validate=False)
+
+    def banco_frio():
+        # Índice y banco se vuelven a leer del disco, como en el primer acceso del proceso
+        invalidar_banco()
+        nuevo = cargar_banco()
+        for nombre in AREAS:
+            nuevo.por_area[nombre]
+
+    def generate_gatb_questions_frio():
+        invalidar_banco()
+        generate_gatb_questions()
+
+    casos = [
+        ("banco.cargar_frio", banco_frio),
+        ("banco.generate_gatb_questions_frio", generate_gatb_questions_frio),
+        ("sesion.area_completa", lambda: area_completa(respuestas, banco, area)),
+        ("sesion.area_completa_adaptativo", lambda: area_completa(respuestas, banco, area, adaptativo=True)),
+        ("sesion.calcular_resultados", lambda: calcular_resultados(respuestas, tiempos, banco, clave)),
+        ("sesion.calcular_resultados_adaptativo",
+         lambda: calcular_resultados(respuestas, tiempos, banco, clave, adaptativo=True)),
+        ("sesion.calcular_resultados_simulado", lambda: resultados_compactos_desde_percentiles(generate_random_percentiles())),
+        ("analisis.generate_random_percentiles", generate_random_percentiles),
+        ("analisis.get_analisis_detalle", lambda: get_analisis_detalle(df)),
+        ("grafico.radar_construir", lambda: radar_figura(areas, valores)),
+        ("grafico.radar_spec", lambda: radar_spec.__wrapped__(areas, valores)),
+        ("grafico.radar_rerun", radar_rerun),
+        ("grafico.radar_svg", lambda: radar_svg.__wrapped__(areas, valores)),
+    ]
+    for n in (1, 1000, 100000):
+        matriz = rng.integers(-1, 4, size=(n, len(clave.ids)), dtype=np.int8)
+        casos.append((f"lote.puntuar_{n}", lambda matriz=matriz: puntuar(matriz, clave)))
+    catalogo = cargar_catalogo()
+    for n in (1, 1000):
+        percentiles = rng.uniform(0, 100, size=(n, len(AREAS)))
+        casos.append((f"ocupaciones.ajustar_{n}", lambda percentiles=percentiles: catalogo.ajustar(percentiles)))
+    return casos
+
+
+def medir(funcion, repeticiones=5, objetivo=0.2):
+    """Mediana y mínimo (µs por llamada) de `repeticiones` tandas de iteraciones calibradas."""
+    funcion()  # Calentamiento (importaciones perezosas, cachés)
+    iteraciones = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion()
+        duracion = time.perf_counter() - inicio
+        if duracion >= objetivo / 4 or iteraciones >= 1 << 20:
+            break
+        iteraciones *= 4
+    iteraciones = max(1, round(iteraciones * objetivo / max(duracion, 1e-9)))
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for _ in range(iteraciones):
+            funcion()
+        tiempos.append((time.perf_counter() - inicio) / iteraciones * 1e6)
+    return {"mediana_us": round(statistics.median(tiempos), 3), "min_us": round(min(tiempos), 3),
+            "iteraciones": iteraciones}
+
+
+def _procesador():
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as f:
+            for linea in f:
+                if linea.startswith("model name"):
+                    return linea.split(":", 1)[1].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+
+def entorno():
+    """Datos de la máquina y versiones, guardados junto a la base para interpretar las comparaciones."""
+    import pandas as pd
+
+    return {"python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__,
+            "plataforma": platform.platform(), "procesador": _procesador(), "cpus": os.cpu_count()}
+
+
+def huella(datos_entorno):
+    """Identificador de máquina de una base: procesador, CPU y versiones de Python y numpy (no el nombre del host)."""
+    clave = "|".join(str(datos_entorno.get(campo)) for campo in ("procesador", "cpus", "python", "numpy"))
+    return hashlib.sha1(clave.encode("utf-8")).hexdigest()[:12]
+
+
+def comparar(actual, base, tolerancia, relativa=False):
+    """Filas (caso, base µs, actual µs, razón, razón normalizada, estado), si hubo regresión y la escala usada.
+
+    Con ``relativa`` y al menos MIN_CASOS_RELATIVOS casos en común, la razón de cada caso se
+    divide por la mediana de las razones si esta supera 1 (una máquina más lenta en general
+    no marca todos los casos, pero tampoco una regresión general); si no, la escala es 1.
+    """
+    razones = {nombre: medida["mediana_us"] / base[nombre]["mediana_us"]
+               for nombre, medida in actual.items() if nombre in base}
+    escala = 1.0
+    if relativa and len(razones) >= MIN_CASOS_RELATIVOS:
+        escala = max(statistics.median(razones.values()), 1.0)
+    filas, regresion = [], False
+    for nombre, medida in actual.items():
+        if nombre not in razones:
+            filas.append((nombre, None, medida["mediana_us"], None, None, "nuevo"))
+            continue
+        normalizada = razones[nombre] / escala
+        estado = "REGRESIÓN" if normalizada > 1 + tolerancia else "mejora" if normalizada < 1 - tolerancia else "ok"
+        regresion |= estado == "REGRESIÓN"
+        filas.append((nombre, base[nombre]["mediana_us"], medida["mediana_us"], razones[nombre], normalizada, estado))
+    return filas, regresion, escala
+
+
+def _formato_us(valor):
+    if valor is None:
+        return "-"
+    return f"{valor / 1000:.2f} ms" if valor >= 1000 else f"{valor:.1f} µs"
+
+
+def _formato_razon(valor):
+    return "-" if valor is None else f"{valor:.2f}"
+
+
+def main(argv=None):
+    """Punto de entrada de la línea de comandos."""
+    parser = argparse.ArgumentParser(description="Microbenchmarks del núcleo GABT con línea base.")
+    parser.add_argument("--base", default=RUTA_BASE, help="Archivo JSON de las líneas base")
+    parser.add_argument("--guardar", action="store_true", help="Reemplaza la línea base de esta máquina")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Aumento relativo de la mediana tolerado")
+    parser.add_argument("--relativa", action="store_true",
+                        help="Normaliza las razones por su mediana (si supera 1) antes de aplicar la tolerancia")
+    parser.add_argument("--confirmaciones", type=int, default=2,
+                        help="Nuevas mediciones de un caso marcado antes de darlo por regresión")
+    parser.add_argument("--repeticiones", type=int, default=5, help="Repeticiones por caso")
+    parser.add_argument("--objetivo", type=float, default=0.2, help="Segundos por repetición (calibra las iteraciones)")
+    parser.add_argument("--filtro", default="", help="Solo los casos cuyo nombre contiene este texto")
+    args = parser.parse_args(argv)
+
+    casos = {nombre: funcion for nombre, funcion in _casos() if args.filtro in nombre}
+    actual = {}
+    for nombre, funcion in casos.items():
+        actual[nombre] = medir(funcion, args.repeticiones, args.objetivo)
+        print(f"  {nombre:<45} {_formato_us(actual[nombre]['mediana_us']):>12}", file=sys.stderr)
+
+    maquinas = {}
+    if os.path.exists(args.base):
+        with open(args.base, encoding="utf-8") as f:
+            datos = json.load(f)
+        if datos.get("formato") == FORMATO_BASE:
+            maquinas = datos["maquinas"]
+    datos_entorno = entorno()
+    maquina = huella(datos_entorno)
+    base = maquinas.get(maquina, {}).get("casos", {})
+
+    regresion = False
+    if base:
+        filas, regresion, escala = comparar(actual, base, args.tolerancia, relativa=args.relativa)
+        for _ in range(args.confirmaciones if regresion else 0):
+            # El ruido de la máquina rara vez se repite en el mismo caso; una regresión real sí
+            for nombre in [fila[0] for fila in filas if fila[-1] == "REGRESIÓN"]:
+                medida = medir(casos[nombre], args.repeticiones, args.objetivo)
+                print(f"  {nombre:<45} {_formato_us(medida['mediana_us']):>12} (confirmación)", file=sys.stderr)
+                if medida["mediana_us"] < actual[nombre]["mediana_us"]:
+                    actual[nombre] = medida
+            filas, regresion, escala = comparar(actual, base, args.tolerancia, relativa=args.relativa)
+            if not regresion:
+                break
+        if args.relativa:
+            print(f"\nRazones normalizadas por {escala:.2f} (mediana de las razones, mínimo 1; "
+                  f"se requieren {MIN_CASOS_RELATIVOS} casos en común)")
+        print(f"\n{'caso':<45} {'base':>12} {'actual':>12} {'razón':>7} {'normal.':>7}  estado")
+        for nombre, previa, medida, razon, normalizada, estado in filas:
+            print(f"{nombre:<45} {_formato_us(previa):>12} {_formato_us(medida):>12} "
+                  f"{_formato_razon(razon):>7} {_formato_razon(normalizada):>7}  {estado}")
+    elif not args.guardar:
+        print(f"\nSin línea base para esta máquina ({maquina}) en {args.base}; "
+              "use --guardar para registrarla. No se evalúan regresiones.", file=sys.stderr)
+
+    if args.guardar:
+        for nombre, funcion in casos.items():
+            medidas = [actual[nombre]] + [medir(funcion, args.repeticiones, args.objetivo)
+                                          for _ in range(args.confirmaciones)]
+            actual[nombre] = sorted(medidas, key=lambda m: m["mediana_us"])[len(medidas) // 2]
+        maquinas[maquina] = {"entorno": datos_entorno, "casos": {**base, **actual} if args.filtro else actual}
+        with open(args.base, "w", encoding="utf-8") as f:
+            json.dump({"formato": FORMATO_BASE, "maquinas": maquinas}, f, ensure_ascii=False, indent=2)
+            f.write("\n")
+        print(f"Línea base de la máquina {maquina} guardada en {args.base}", file=sys.stderr)
+        return 0
+    return 1 if regresion else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,45 @@
+"""Pasos del test que la app ejecuta en sus callbacks, sin Streamlit, para poder reutilizarlos y medirlos.
+
+``mn.py`` pasa el estado de la sesión (respuestas, tiempos) y el modo del test; guardar,
+encolar y exportar lo que devuelven queda en la app.
+"""
+
+from dataclasses import dataclass
+
+import numpy as np
+
+from gabt.adaptativo import estimar_area, puntuar_adaptativo
+from gabt.cohortes import Agregado
+from gabt.estado import ResultadosCompactos
+from gabt.puntuacion import codificar_respuestas, puntuar_sesion
+from gabt.tiempos import aciertos_por_minuto
+
+
+@dataclass(frozen=True, eq=False)
+class ResultadosSesion:
+    """Lo que produce terminar el test: resultados para la sesión, rapidez y agregado de la cohorte."""
+    resultados: ResultadosCompactos
+    velocidad: np.ndarray
+    agregado: Agregado
+
+
+def contar_respondidas(respuestas, banco, area):
+    """Preguntas respondidas del área, usando el índice precalculado del banco."""
+    return sum(1 for q_id in banco.por_area[area].ids if respuestas.get(q_id) is not None)
+
+
+def area_completa(respuestas, banco, area, adaptativo=False):
+    """Si el área está terminada: todas sus preguntas respondidas o, en modo adaptativo, la estimación cerrada."""
+    if adaptativo:
+        return estimar_area(area, respuestas, banco).terminada
+    return contar_respondidas(respuestas, banco, area) == len(banco.por_area[area])
+
+
+def calcular_resultados(respuestas, tiempos, banco, clave, adaptativo=False):
+    """Puntúa las respuestas de la sesión con el motor vectorizado de gabt.puntuacion (o el adaptativo)."""
+    resultados = (puntuar_adaptativo if adaptativo else puntuar_sesion)(respuestas, banco)
+    return ResultadosSesion(
+        resultados=ResultadosCompactos.desde_resultados(resultados),
+        velocidad=aciertos_por_minuto(codificar_respuestas(respuestas, clave), tiempos, clave),
+        agregado=Agregado.desde_resultados(resultados),
+    )
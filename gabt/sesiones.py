@@ -0,0 +1,334 @@
+"""Persistencia de sesiones de candidatos: respuestas, avance y resultados, reanudables por token.
+
+El almacén por defecto es SQLite en modo WAL. Las escrituras se acumulan en memoria y
+se vuelcan en lotes (una transacción cada ``intervalo`` segundos o al superar
+``max_pendientes``), de modo que varios clics sobre la misma pregunta producen una
+sola escritura. La tabla ``eventos`` es un registro de solo anexado con los tiempos por
+ítem (ver ``gabt.tiempos``) para el análisis de latencias. Configuración por entorno:
+
+    GABT_SESIONES      'sqlite' (por defecto) o 'memoria'
+    GABT_SESIONES_DB   ruta del archivo SQLite (por defecto 'gabt_sesiones.db')
+
+Si un volcado falla (base bloqueada, disco lleno), el lote vuelve a los búferes sin pisar
+las escrituras más recientes, el error se registra con ``logging`` y el hilo reintenta con
+espera exponencial (hasta ``ESPERA_MAXIMA`` segundos) sin detenerse.
+"""
+
+import atexit
+import json
+import logging
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+_log = logging.getLogger(__name__)
+# Espera máxima (s) entre reintentos de un volcado fallido
+ESPERA_MAXIMA = 60.0
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS sesiones (
+    token TEXT PRIMARY KEY,
+    stage TEXT NOT NULL,
+    area_actual_index INTEGER NOT NULL,
+    banco_version TEXT,
+    actualizado REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS respuestas (
+    token TEXT NOT NULL,
+    pregunta_id INTEGER NOT NULL,
+    opcion TEXT NOT NULL,
+    PRIMARY KEY (token, pregunta_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS resultados (
+    token TEXT PRIMARY KEY,
+    datos TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS eventos (
+    token TEXT NOT NULL,
+    pregunta_id INTEGER NOT NULL,
+    tipo TEXT NOT NULL,
+    opcion TEXT,
+    instante REAL NOT NULL
+);
+"""
+
+
+def _a_json(valor):
+    """Serializa escalares numpy (p. ej. de DataFrame.to_dict) como tipos nativos."""
+    return valor.item() if hasattr(valor, "item") else str(valor)
+
+
+def nuevo_token():
+    """Token opaco para reanudar una sesión."""
+    return secrets.token_urlsafe(16)
+
+
+class AlmacenSesiones:
+    """Interfaz del almacén de sesiones. Las implementaciones pueden diferir las escrituras."""
+
+    def cargar(self, token):
+        """Devuelve {'stage', 'area_actual_index', 'banco_version', 'respuestas', 'resultados'} o None."""
+        raise NotImplementedError
+
+    def guardar_respuesta(self, token, pregunta_id, opcion):
+        raise NotImplementedError
+
+    def guardar_estado(self, token, stage, area_actual_index, banco_version=None):
+        raise NotImplementedError
+
+    def guardar_resultados(self, token, registros):
+        """Guarda los resultados como lista de dicts (una fila por área)."""
+        raise NotImplementedError
+
+    def guardar_eventos(self, token, filas):
+        """Añade eventos de tiempo (pregunta_id, tipo, opción, instante) al registro de la sesión."""
+        raise NotImplementedError
+
+    def reiniciar(self, token):
+        """Borra respuestas y resultados de la sesión (el registro de eventos se conserva)."""
+        raise NotImplementedError
+
+    def flush(self):
+        pass
+
+    def cerrar(self):
+        self.flush()
+
+
+class AlmacenMemoria(AlmacenSesiones):
+    """Almacén en memoria del proceso (sin durabilidad); útil para desarrollo y pruebas."""
+
+    def __init__(self):
+        self._sesiones = {}
+        self._lock = threading.Lock()
+
+    def _sesion(self, token):
+        return self._sesiones.setdefault(token, {
+            "stage": "inicio", "area_actual_index": 0, "banco_version": None,
+            "respuestas": {}, "resultados": None, "eventos": [],
+        })
+
+    def cargar(self, token):
+        with self._lock:
+            sesion = self._sesiones.get(token)
+            if sesion is None:
+                return None
+            return {k: v for k, v in sesion.items() if k != "eventos"} | {"respuestas": dict(sesion["respuestas"])}
+
+    def guardar_respuesta(self, token, pregunta_id, opcion):
+        with self._lock:
+            self._sesion(token)["respuestas"][pregunta_id] = opcion
+
+    def guardar_estado(self, token, stage, area_actual_index, banco_version=None):
+        with self._lock:
+            self._sesion(token).update(stage=stage, area_actual_index=area_actual_index, banco_version=banco_version)
+
+    def guardar_resultados(self, token, registros):
+        with self._lock:
+            self._sesion(token)["resultados"] = list(registros)
+
+    def guardar_eventos(self, token, filas):
+        with self._lock:
+            self._sesion(token)["eventos"].extend(filas)
+
+    def reiniciar(self, token):
+        with self._lock:
+            sesion = self._sesion(token)
+            sesion["respuestas"].clear()
+            sesion["resultados"] = None
+
+
+class AlmacenSQLite(AlmacenSesiones):
+    """Almacén SQLite (WAL) con escrituras coalescidas y volcadas en lotes por un hilo de fondo."""
+
+    def __init__(self, ruta, intervalo=1.0, max_pendientes=2000):
+        self.ruta = ruta
+        self.intervalo = intervalo
+        self.max_pendientes = max_pendientes
+        self._conn = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.executescript(ESQUEMA)
+        # _lock protege los búferes; _lock_escritura serializa los volcados a disco
+        self._lock = threading.Lock()
+        self._lock_escritura = threading.Lock()
+        self._respuestas = {}
+        self._estados = {}
+        self._resultados = {}
+        self._eventos = []
+        self._reinicios = set()
+        self._despertar = threading.Event()
+        self._parada = threading.Event()
+        self._cerrado = False
+        self.fallos = 0  # Volcados fallidos (cada uno se reintenta)
+        self._hilo = threading.Thread(target=self._bucle, name="gabt-sesiones-flush", daemon=True)
+        self._hilo.start()
+        atexit.register(self.cerrar)
+
+    def _pendientes(self):
+        return len(self._respuestas) + len(self._estados) + len(self._resultados) + len(self._eventos) + len(self._reinicios)
+
+    def _encolar(self):
+        if self._pendientes() >= self.max_pendientes:
+            self._despertar.set()
+
+    def _bucle(self):
+        espera = self.intervalo
+        while not self._cerrado:
+            self._despertar.wait(self.intervalo)
+            self._despertar.clear()
+            try:
+                self.flush()
+            except Exception:
+                _log.exception("No se pudo volcar el lote de sesiones; se reintenta en %.1f s", espera)
+                # La espera solo la interrumpe el cierre, no las escrituras nuevas
+                self._parada.wait(espera)
+                espera = min(espera * 2, ESPERA_MAXIMA)
+            else:
+                espera = self.intervalo
+
+    def guardar_respuesta(self, token, pregunta_id, opcion):
+        with self._lock:
+            self._respuestas[(token, int(pregunta_id))] = opcion
+            self._encolar()
+
+    def guardar_estado(self, token, stage, area_actual_index, banco_version=None):
+        with self._lock:
+            self._estados[token] = (stage, int(area_actual_index), banco_version, time.time())
+            self._encolar()
+
+    def guardar_resultados(self, token, registros):
+        datos = json.dumps(list(registros), ensure_ascii=False, default=_a_json)
+        with self._lock:
+            self._resultados[token] = datos
+            self._encolar()
+
+    def guardar_eventos(self, token, filas):
+        with self._lock:
+            self._eventos.extend((token, *fila) for fila in filas)
+            self._encolar()
+
+    def reiniciar(self, token):
+        with self._lock:
+            # Lo pendiente de esta sesión queda obsoleto: se descarta antes de llegar a disco
+            self._respuestas = {k: v for k, v in self._respuestas.items() if k[0] != token}
+            self._resultados.pop(token, None)
+            self._reinicios.add(token)
+            self._encolar()
+
+    def _devolver(self, respuestas, estados, resultados, eventos, reinicios):
+        """Devuelve a los búferes un lote que no llegó a disco; lo escrito después tiene prioridad."""
+        with self._lock:
+            # Un reinicio posterior al lote deja obsoletas sus respuestas y resultados
+            nuevos_reinicios = self._reinicios
+            self._respuestas = {k: v for k, v in respuestas.items() if k[0] not in nuevos_reinicios} | self._respuestas
+            self._resultados = {t: d for t, d in resultados.items() if t not in nuevos_reinicios} | self._resultados
+            self._estados = estados | self._estados
+            self._eventos = eventos + self._eventos
+            self._reinicios = reinicios | nuevos_reinicios
+
+    def flush(self):
+        """Vuelca todas las escrituras pendientes en una sola transacción; si falla, las conserva y relanza."""
+        with self._lock_escritura:
+            if self._conn is None:
+                return
+            with self._lock:
+                if not self._pendientes():
+                    return
+                respuestas, self._respuestas = self._respuestas, {}
+                estados, self._estados = self._estados, {}
+                resultados, self._resultados = self._resultados, {}
+                eventos, self._eventos = self._eventos, []
+                reinicios, self._reinicios = self._reinicios, set()
+            conn = self._conn
+            try:
+                conn.execute("BEGIN")
+                if reinicios:
+                    borrar = [(t,) for t in reinicios]
+                    conn.executemany("DELETE FROM respuestas WHERE token = ?", borrar)
+                    conn.executemany("DELETE FROM resultados WHERE token = ?", borrar)
+                if estados:
+                    conn.executemany(
+                        "INSERT INTO sesiones (token, stage, area_actual_index, banco_version, actualizado) "
+                        "VALUES (?, ?, ?, ?, ?) ON CONFLICT(token) DO UPDATE SET stage = excluded.stage, "
+                        "area_actual_index = excluded.area_actual_index, banco_version = excluded.banco_version, "
+                        "actualizado = excluded.actualizado",
+                        [(t, *estado) for t, estado in estados.items()],
+                    )
+                if respuestas:
+                    conn.executemany(
+                        "INSERT INTO respuestas (token, pregunta_id, opcion) VALUES (?, ?, ?) "
+                        "ON CONFLICT(token, pregunta_id) DO UPDATE SET opcion = excluded.opcion",
+                        [(t, q_id, opcion) for (t, q_id), opcion in respuestas.items()],
+                    )
+                if resultados:
+                    conn.executemany(
+                        "INSERT INTO resultados (token, datos) VALUES (?, ?) "
+                        "ON CONFLICT(token) DO UPDATE SET datos = excluded.datos",
+                        list(resultados.items()),
+                    )
+                if eventos:
+                    conn.executemany(
+                        "INSERT INTO eventos (token, pregunta_id, tipo, opcion, instante) VALUES (?, ?, ?, ?, ?)",
+                        eventos,
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                self.fallos += 1
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                self._devolver(respuestas, estados, resultados, eventos, reinicios)
+                raise
+
+    def cargar(self, token):
+        try:
+            self.flush()
+        except sqlite3.Error:
+            # Lo pendiente sigue en los búferes; se lee lo que ya está en disco
+            _log.exception("No se pudo volcar antes de cargar la sesión")
+        with self._lock_escritura:
+            if self._conn is None:
+                return None
+            fila = self._conn.execute(
+                "SELECT stage, area_actual_index, banco_version FROM sesiones WHERE token = ?", (token,)
+            ).fetchone()
+            if fila is None:
+                return None
+            respuestas = dict(self._conn.execute(
+                "SELECT pregunta_id, opcion FROM respuestas WHERE token = ?", (token,)
+            ).fetchall())
+            datos = self._conn.execute("SELECT datos FROM resultados WHERE token = ?", (token,)).fetchone()
+        return {
+            "stage": fila[0],
+            "area_actual_index": fila[1],
+            "banco_version": fila[2],
+            "respuestas": respuestas,
+            "resultados": json.loads(datos[0]) if datos else None,
+        }
+
+    def cerrar(self):
+        if self._cerrado:
+            return
+        self._cerrado = True
+        self._despertar.set()
+        self._parada.set()
+        try:
+            self.flush()
+        except Exception:
+            _log.exception("Se perdieron %d escrituras de sesiones pendientes al cerrar", self._pendientes())
+        with self._lock_escritura:
+            self._conn.close()
+            self._conn = None
+
+
+@lru_cache(maxsize=1)
+def obtener_almacen():
+    """Almacén de sesiones compartido por todo el proceso, según la configuración del entorno."""
+    tipo = os.environ.get("GABT_SESIONES", "sqlite").strip().lower()
+    if tipo == "memoria":
+        return AlmacenMemoria()
+    return AlmacenSQLite(os.environ.get("GABT_SESIONES_DB", "gabt_sesiones.db"))
@@ -0,0 +1,112 @@
+"""Tiempos de respuesta por ítem: primera vista, primera respuesta y cambios, con reloj monotónico.
+
+Cada sesión guarda un ``TiemposSesion``: tres arreglos de tamaño fijo por ítem del banco
+(los instantes son segundos desde el inicio de la sesión) y un búfer circular de eventos
+que se vuelca en lotes al almacén de sesiones. Registrar un evento son unas pocas
+escrituras en arreglos ya reservados; si el búfer se llena antes de volcarse, los
+eventos más antiguos se pierden (y se cuentan en ``perdidos``), pero los arreglos por
+ítem siguen completos.
+
+Con los tiempos se calcula una puntuación de rapidez para las áreas de velocidad:
+aciertos por minuto de trabajo en el área (desde la primera vista hasta la última
+primera respuesta).
+"""
+
+import time
+
+import numpy as np
+
+from gabt.aptitudes import AREAS
+from gabt.puntuacion import CODIGO_OPCION, OPCIONES
+
+VISTA, RESPUESTA, CAMBIO = 0, 1, 2
+TIPOS_EVENTO = ("vista", "respuesta", "cambio")
+DTYPE_EVENTO = np.dtype([("t", "<f8"), ("posicion", "<u2"), ("tipo", "u1"), ("opcion", "i1")])
+# Áreas en las que la rapidez forma parte de la aptitud medida
+AREAS_VELOCIDAD = ("Velocidad Perceptiva", "Atención Concentrada")
+
+
+class TiemposSesion:
+    """Tiempos por ítem de una sesión y búfer circular de eventos pendientes de volcar."""
+
+    __slots__ = ("_ids", "_posicion", "_origen", "_origen_reloj", "primera_vista", "primera_respuesta", "cambios",
+                 "_eventos", "_escritos", "_volcados", "perdidos")
+
+    def __init__(self, clave, capacidad=256):
+        n_items = len(clave.ids)
+        self._ids = clave.ids
+        self._posicion = clave.posicion
+        self._origen = time.monotonic()
+        self._origen_reloj = time.time()
+        self.primera_vista = np.full(n_items, np.nan, dtype=np.float32)
+        self.primera_respuesta = np.full(n_items, np.nan, dtype=np.float32)
+        self.cambios = np.zeros(n_items, dtype=np.uint8)
+        self._eventos = np.zeros(capacidad, dtype=DTYPE_EVENTO)
+        self._escritos = 0  # Eventos registrados desde el inicio
+        self._volcados = 0  # Eventos ya entregados (o perdidos)
+        self.perdidos = 0
+
+    def _registrar(self, tipo, pos, opcion, t):
+        if self._escritos - self._volcados == len(self._eventos):
+            self._volcados += 1
+            self.perdidos += 1
+        self._eventos[self._escritos % len(self._eventos)] = (t, pos, tipo, opcion)
+        self._escritos += 1
+
+    def vista(self, q_id):
+        """Marca la primera vez que el ítem se muestra (las siguientes no registran nada)."""
+        pos = self._posicion[q_id]
+        if self.primera_vista[pos] != self.primera_vista[pos]:  # NaN: aún no visto
+            t = time.monotonic() - self._origen
+            self.primera_vista[pos] = t
+            self._registrar(VISTA, pos, -1, t)
+
+    def respuesta(self, q_id, opcion):
+        """Registra una respuesta: la primera fija el tiempo de respuesta, las demás cuentan como cambios."""
+        pos = self._posicion[q_id]
+        t = time.monotonic() - self._origen
+        if self.primera_respuesta[pos] != self.primera_respuesta[pos]:
+            self.primera_respuesta[pos] = t
+            tipo = RESPUESTA
+        else:
+            self.cambios[pos] = min(int(self.cambios[pos]) + 1, 255)
+            tipo = CAMBIO
+        self._registrar(tipo, pos, CODIGO_OPCION[opcion], t)
+
+    @property
+    def pendientes(self):
+        return self._escritos - self._volcados
+
+    def volcar(self):
+        """Eventos pendientes como filas (id, tipo, opción, instante Unix) y los da por volcados."""
+        posiciones = np.arange(self._volcados, self._escritos) % len(self._eventos)
+        eventos = self._eventos[posiciones]
+        self._volcados = self._escritos
+        return [
+            (self._ids[pos], TIPOS_EVENTO[tipo], OPCIONES[opcion] if opcion >= 0 else None, self._origen_reloj + t)
+            for t, pos, tipo, opcion in eventos.tolist()
+        ]
+
+    def latencias(self):
+        """Segundos entre la primera vista y la primera respuesta de cada ítem (NaN si falta alguna)."""
+        return self.primera_respuesta - self.primera_vista
+
+
+def tiempo_por_area(tiempos, clave):
+    """Segundos de trabajo en cada área (en el orden de AREAS): de la primera vista a la última primera respuesta."""
+    segundos = np.full(len(AREAS), np.nan)
+    for a in range(len(AREAS)):
+        en_area = clave.area_por_item == a
+        vistas = tiempos.primera_vista[en_area]
+        respuestas = tiempos.primera_respuesta[en_area]
+        if np.isfinite(vistas).any() and np.isfinite(respuestas).any():
+            segundos[a] = np.nanmax(respuestas) - np.nanmin(vistas)
+    return segundos
+
+
+def aciertos_por_minuto(codigos, tiempos, clave):
+    """Puntuación de rapidez por área: aciertos por minuto de trabajo (NaN en áreas sin tiempos)."""
+    aciertos = (np.asarray(codigos) == clave.correctas).astype(np.int32) @ clave.matriz_areas
+    minutos = tiempo_por_area(tiempos, clave) / 60
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(minutos > 0, aciertos / minutos, np.nan)